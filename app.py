@@ -2,25 +2,127 @@
 
 from __future__ import annotations
 
-import matplotlib.pyplot as plt
+import asyncio
+import threading
+from collections.abc import Callable, Coroutine
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
 import pandas as pd
 import streamlit as st
+from openai import AsyncOpenAI
 
 from components.tab_bivariate import render as render_bivariate
 from components.tab_summary import render as render_summary
 from components.tab_univariate import render as render_univariate
 from modules.ai_insights import (
+    build_user_message,
     generate_batch_commentary,
     generate_insight_plots,
     generate_questions,
 )
-from modules.bivariate_plots import generate_bivariate_plots
 from modules.chart_helpers import PlotResult, save_plot
 from modules.constants import MAX_ROWS_DEFAULT
-from modules.data_loader import load_csv
+from modules.data_loader import file_digest, load_csv
 from modules.schema_detector import SchemaInfo, detect_schema
 from modules.schema_parser import UserSchema, parse_schema_text
-from modules.univariate_plots import generate_univariate_plots
+
+T = TypeVar("T")
+
+
+@st.cache_resource
+def _event_loop() -> asyncio.AbstractEventLoop:
+    """Start a background event loop for OpenAI requests.
+
+    Running the loop on its own thread lets a request be started early
+    in the script and collected later, instead of blocking where it is
+    issued.
+
+    Returns:
+        The running event loop.
+    """
+    loop = asyncio.new_event_loop()
+    threading.Thread(target=loop.run_forever, daemon=True).start()
+    return loop
+
+
+@st.cache_resource(max_entries=4)
+def _openai_client(api_key: str) -> AsyncOpenAI:
+    """Return the shared async OpenAI client for an API key.
+
+    Every request runs on the one background event loop, so a single
+    client per key can serve them all and its connection pool keeps
+    TLS connections alive between requests.
+
+    Args:
+        api_key: OpenAI API key.
+
+    Returns:
+        The client for ``api_key``.
+    """
+    return AsyncOpenAI(api_key=api_key)
+
+
+def _submit(coro: Coroutine[Any, Any, T]) -> Future[T]:
+    """Schedule a coroutine on the background event loop.
+
+    Args:
+        coro: The coroutine to run.
+
+    Returns:
+        A future resolving to the coroutine's result.
+    """
+    return asyncio.run_coroutine_threadsafe(coro, _event_loop())
+
+
+def _session_value(name: str, compute: Callable[[], T]) -> T:
+    """Return a session-state entry, computing and storing it if unset.
+
+    Args:
+        name: The ``st.session_state`` key.
+        compute: Zero-argument callable producing the value.
+
+    Returns:
+        The stored (or freshly computed) value.
+    """
+    if st.session_state.get(name) is None:
+        st.session_state[name] = compute()
+    return st.session_state[name]
+
+
+def _commentary_for(
+    name: str,
+    plots: list[PlotResult],
+    api_key: str,
+) -> dict[str, str] | None:
+    """Fetch AI commentary for one tab's plots.
+
+    Each tab's commentary is requested separately and kept in session
+    state once every plot has some, so reruns (or changes in another
+    tab's plots) do not go back to the event loop for it.
+
+    Args:
+        name: The ``st.session_state`` key for this tab's commentary.
+        plots: The plots shown in the tab.
+        api_key: OpenAI API key (may be empty).
+
+    Returns:
+        Dict mapping chart titles to commentary, or None when no API
+        key is set or nothing was returned.
+    """
+    if not api_key or not plots:
+        return None
+    stored = st.session_state.get(name)
+    if stored is not None and stored[0] == api_key:
+        return stored[1]
+    with st.spinner("Generating AI commentary..."):
+        commentary = _submit(
+            generate_batch_commentary(plots, _openai_client(api_key))
+        ).result()
+    if all(plot.title in commentary for plot in plots):
+        st.session_state[name] = (api_key, commentary)
+    return commentary or None
+
 
 st.set_page_config(
     page_title="CSV Dashboard Generator",
@@ -64,68 +166,93 @@ tab1, tab2, tab3, tab4, tab5 = st.tabs(
     ]
 )
 
+# ── Session state ─────────────────────────────────────────────
+# Loaded data and everything derived from it survive reruns; they are
+# rebuilt only when the upload, row cap or parsed schema changes.
+_DERIVED_KEYS = (
+    "uni_plots", "uni_commentary",
+    "biv_plots", "biv_commentary",
+    "questions_future", "insight_plots", "insight_commentary",
+)
+for _key in (
+    "data_key", "df", "load_warnings", "schema_key", "schema_info",
+    *_DERIVED_KEYS,
+):
+    if _key not in st.session_state:
+        st.session_state[_key] = None
+
 # ── Data loading & schema detection ───────────────────────────
 df: pd.DataFrame | None = None
 schema_info: SchemaInfo | None = None
 
 if uploaded_file is not None:
-    try:
-        file_bytes = uploaded_file.getvalue()
-        df, warnings = load_csv(
-            file_bytes, uploaded_file.name, max_rows,
+    # Hash and parse the upload through a zero-copy view of its buffer.
+    content_key = file_digest(uploaded_file.getbuffer())
+    data_key = f"{content_key}:{max_rows}"
+    if st.session_state.data_key != data_key:
+        try:
+            df, warnings = load_csv(
+                content_key, uploaded_file.name, max_rows,
+                _file_bytes=uploaded_file.getbuffer(),
+            )
+        except ValueError as exc:
+            st.error(str(exc))
+            st.stop()
+        st.session_state.update(
+            data_key=data_key,
+            df=df,
+            load_warnings=warnings,
+            schema_key=None,
         )
-        for w in warnings:
-            st.warning(w)
-    except ValueError as exc:
-        st.error(str(exc))
-        st.stop()
+    df = st.session_state.df
+    for w in st.session_state.load_warnings:
+        st.warning(w)
 
     # Parse user schema (requires API key; skip if not provided)
-    user_schema: UserSchema | None = None
-    if schema_text and schema_text.strip() and api_key:
-        with st.spinner("Parsing schema description..."):
-            user_schema = parse_schema_text(
-                schema_text,
-                list(df.columns),
-                api_key,
-            )
-    elif schema_text and schema_text.strip() and not api_key:
+    has_schema_text = bool(schema_text and schema_text.strip())
+    if has_schema_text and not api_key:
         st.info(
             "Enter an OpenAI API key in the sidebar to "
             "parse the schema description. Using "
             "auto-detection only."
         )
 
-    schema_info = detect_schema(df, user_schema)
-
-# ── Pre-generate plots & commentary ──────────────────────────
-uni_plots: list[PlotResult] = []
-biv_plots: list[PlotResult] = []
-insight_plots: list[PlotResult] = []
-questions: list[dict] = []
-commentary: dict[str, str] = {}
-
-if df is not None and schema_info is not None:
-    uni_plots = generate_univariate_plots(df, schema_info)
-    biv_plots = generate_bivariate_plots(df, schema_info)
-
-    if api_key:
-        with st.spinner("Generating AI insights..."):
-            questions = generate_questions(
-                schema_info, df, api_key,
-            )
-        if questions:
-            insight_plots = generate_insight_plots(
-                df, questions,
-            )
+    # The schema text only matters when it can be parsed
+    schema_key = (data_key, schema_text.strip() if api_key else "")
+    if st.session_state.schema_key != schema_key:
+        user_schema: UserSchema | None = None
+        if has_schema_text and api_key:
+            with st.spinner("Parsing schema description..."):
+                user_schema = _submit(
+                    parse_schema_text(
+                        schema_text,
+                        list(df.columns),
+                        _openai_client(api_key),
+                    )
+                ).result()
+        st.session_state.update(
+            schema_key=schema_key,
+            schema_info=detect_schema(df, user_schema),
+            **dict.fromkeys(_DERIVED_KEYS),
+        )
+    schema_info = st.session_state.schema_info
 
-    # Batch commentary for all plots when API key is present
-    all_plots = uni_plots + biv_plots + insight_plots
-    if api_key and all_plots:
-        with st.spinner("Generating AI commentary..."):
-            commentary = generate_batch_commentary(
-                all_plots, api_key,
+    # Start question generation now; the AI Insights tab collects it.
+    # A failed request is reported in that tab and retried on the next
+    # rerun.
+    questions_future = st.session_state.questions_future
+    if api_key and (
+        questions_future is None
+        or (questions_future.done() and questions_future.exception())
+    ):
+        st.session_state.questions_future = _submit(
+            generate_questions(
+                build_user_message(schema_info, df),
+                list(df.columns),
+                data_key,
+                _openai_client(api_key),
             )
+        )
 
 
 # ── Tab 1: Schema ────────────────────────────────────────────
@@ -156,19 +283,20 @@ with tab1:
             str(len(schema_info.categorical_cols)),
         )
 
-        schema_rows = []
-        for cm in schema_info.columns:
-            schema_rows.append(
-                {
-                    "Column": cm.name,
-                    "Type": cm.semantic_type,
-                    "Description": cm.description or "\u2014",
-                    "Null %": f"{cm.pct_missing}%",
-                    "Unique #": cm.n_unique,
-                }
-            )
+        cols_meta = schema_info.columns
+        schema_table = pd.DataFrame(
+            {
+                "Column": [cm.name for cm in cols_meta],
+                "Type": [cm.semantic_type for cm in cols_meta],
+                "Description": [
+                    cm.description or "\u2014" for cm in cols_meta
+                ],
+                "Null %": [f"{cm.pct_missing}%" for cm in cols_meta],
+                "Unique #": [cm.n_unique for cm in cols_meta],
+            }
+        )
         st.dataframe(
-            pd.DataFrame(schema_rows),
+            schema_table,
             use_container_width=True,
             hide_index=True,
         )
@@ -186,8 +314,17 @@ with tab2:
 # ── Tab 3: Univariate Analysis ──────────────────────────────
 with tab3:
     if df is not None and schema_info is not None:
+        # Plot modules pull in matplotlib/seaborn; load them only once
+        # there is data to plot.
+        from modules.univariate_plots import generate_univariate_plots
+
+        uni_plots = _session_value(
+            "uni_plots",
+            lambda: generate_univariate_plots(df, schema_info),
+        )
         render_univariate(
-            uni_plots, commentary or None,
+            uni_plots,
+            _commentary_for("uni_commentary", uni_plots, api_key),
         )
     else:
         st.info(
@@ -198,8 +335,15 @@ with tab3:
 # ── Tab 4: Bivariate Analysis ───────────────────────────────
 with tab4:
     if df is not None and schema_info is not None:
+        from modules.bivariate_plots import generate_bivariate_plots
+
+        biv_plots = _session_value(
+            "biv_plots",
+            lambda: generate_bivariate_plots(df, schema_info),
+        )
         render_bivariate(
-            biv_plots, commentary or None,
+            biv_plots,
+            _commentary_for("biv_commentary", biv_plots, api_key),
         )
     else:
         st.info(
@@ -219,26 +363,40 @@ with tab5:
             "Enter your OpenAI API key in the sidebar "
             "to enable AI insights."
         )
-    elif not questions:
-        st.warning(
-            "Could not generate insight questions "
-            "for this dataset."
-        )
     else:
-        for question, plot_result in zip(
-            questions, insight_plots,
-        ):
-            st.subheader(question["question"])
-            st.pyplot(plot_result.figure)
-            if commentary and plot_result.title in commentary:
-                st.info(
-                    "**AI Commentary:** "
-                    f"{commentary[plot_result.title]}"
+        try:
+            with st.spinner("Generating AI insights..."):
+                questions = st.session_state.questions_future.result()
+        except Exception as exc:
+            # The next rerun submits a fresh request.
+            st.error(f"Could not generate insight questions: {exc}")
+        else:
+            if not questions:
+                st.warning(
+                    "Could not generate insight questions "
+                    "for this dataset."
                 )
             else:
-                st.caption(
-                    "Provide an API key to enable "
-                    "AI commentary."
+                insight_plots = _session_value(
+                    "insight_plots",
+                    lambda: generate_insight_plots(df, questions),
+                )
+                commentary = _commentary_for(
+                    "insight_commentary", insight_plots, api_key,
                 )
-            save_plot(plot_result, "ai_insights")
-            plt.close(plot_result.figure)
+                for question, plot_result in zip(
+                    questions, insight_plots,
+                ):
+                    st.subheader(question["question"])
+                    st.image(plot_result.png_bytes, width="stretch")
+                    if commentary and plot_result.title in commentary:
+                        st.info(
+                            "**AI Commentary:** "
+                            f"{commentary[plot_result.title]}"
+                        )
+                    else:
+                        st.caption(
+                            "Provide an API key to enable "
+                            "AI commentary."
+                        )
+                    save_plot(plot_result, "ai_insights")
@@ -0,0 +1,81 @@
+"""Shared HTML grid for displaying pre-rendered plots."""
+
+from __future__ import annotations
+
+import base64
+import html
+
+import streamlit as st
+
+from modules.chart_helpers import PlotResult
+
+_GRID_STYLE = (
+    "display:grid;grid-template-columns:repeat(3,minmax(0,1fr));"
+    "gap:1rem;align-items:start"
+)
+_COMMENTARY_STYLE = (
+    "background:rgba(28,131,225,0.1);border-radius:0.5rem;"
+    "padding:0.75rem 1rem;margin:0.5rem 0 0"
+)
+_CAPTION_STYLE = "opacity:0.6;font-size:0.875rem;margin:0.5rem 0 0"
+
+
+def _plot_cell(
+    plot_result: PlotResult,
+    commentary: dict[str, str] | None,
+) -> str:
+    """Build the HTML for one grid cell: the image plus its commentary.
+
+    Args:
+        plot_result: The plot to display.
+        commentary: Dict mapping chart titles to commentary
+            strings, or None if commentary is unavailable.
+
+    Returns:
+        An HTML fragment.
+    """
+    encoded = base64.b64encode(plot_result.png_bytes).decode("ascii")
+    title = html.escape(plot_result.title, quote=True)
+    image = (
+        f'<img src="data:image/png;base64,{encoded}" alt="{title}" '
+        f'style="width:100%">'
+    )
+    if commentary and plot_result.title in commentary:
+        # The blank lines end the HTML block, so Streamlit renders the
+        # commentary as Markdown, as st.info did. Escaping "<" keeps raw
+        # HTML in it from breaking the grid.
+        text = commentary[plot_result.title].strip().replace("<", "&lt;")
+        note = (
+            f'<div style="{_COMMENTARY_STYLE}">\n\n'
+            f"**AI Commentary:** {text}\n\n</div>"
+        )
+    else:
+        note = (
+            f'<p style="{_CAPTION_STYLE}">'
+            "Provide an API key to enable AI commentary.</p>"
+        )
+    return f"<div>{image}{note}</div>"
+
+
+def render_plot_grid(
+    plots: list[PlotResult],
+    commentary: dict[str, str] | None = None,
+) -> None:
+    """Display plots in a 3-column grid as a single Streamlit element.
+
+    Emitting one HTML block with inline PNGs replaces a row of
+    ``st.columns`` plus an image and a note per plot, so the whole
+    grid costs one delta message instead of several per chart.
+
+    Args:
+        plots: Pre-rendered plots to display.
+        commentary: Dict mapping chart titles to AI commentary
+            strings. Defaults to None.
+    """
+    if not plots:
+        return
+    cells = "".join(_plot_cell(plot, commentary) for plot in plots)
+    st.markdown(
+        f'<div style="{_GRID_STYLE}">{cells}</div>',
+        unsafe_allow_html=True,
+    )
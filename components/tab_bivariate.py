@@ -2,9 +2,9 @@
 
 from __future__ import annotations
 
-import matplotlib.pyplot as plt
 import streamlit as st
 
+from components.plot_grid import render_plot_grid
 from modules.chart_helpers import PlotResult, save_plot
 
 
@@ -51,22 +51,13 @@ def render(
     # Render heatmap full-width if it is the first plot
     if plots[0].plot_type == "heatmap":
         heatmap = plots[0]
-        st.pyplot(heatmap.figure)
+        st.image(heatmap.png_bytes, width="stretch")
         _show_commentary(heatmap.title, commentary)
         save_plot(heatmap, "bivariate")
-        plt.close(heatmap.figure)
         start_idx = 1
 
     # Render remaining plots in a 3-column grid
     remaining_plots = plots[start_idx:]
-    for row_start in range(0, len(remaining_plots), 3):
-        row_plots = remaining_plots[row_start : row_start + 3]
-        cols = st.columns(3)
-        for col_idx, plot_result in enumerate(row_plots):
-            with cols[col_idx]:
-                st.pyplot(plot_result.figure)
-                _show_commentary(
-                    plot_result.title, commentary,
-                )
-                save_plot(plot_result, "bivariate")
-                plt.close(plot_result.figure)
+    render_plot_grid(remaining_plots, commentary)
+    for plot_result in remaining_plots:
+        save_plot(plot_result, "bivariate")
@@ -39,9 +39,7 @@ def render(df: pd.DataFrame, schema_info: SchemaInfo) -> None:
     # --- Categorical columns ---
     st.subheader("Categorical Columns")
     if schema_info.categorical_cols:
-        cat_stats = compute_categorical_stats(
-            df, schema_info.categorical_cols
-        )
+        cat_stats = compute_categorical_stats(schema_info)
         st.dataframe(
             cat_stats,
             use_container_width=True,
@@ -2,20 +2,39 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
-import time
+from collections import OrderedDict
+from functools import lru_cache
 from pathlib import Path
+from typing import TYPE_CHECKING
 
-import matplotlib.pyplot as plt
 import pandas as pd
-import seaborn as sns
-from openai import OpenAI
-
-from modules.chart_helpers import PlotResult, configure_plot_style
-from modules.constants import MAX_CATEGORICAL_BARS, OPENAI_MODEL
+import streamlit as st
+from openai import AsyncOpenAI
+
+from modules.chart_helpers import (
+    PlotResult,
+    configure_plot_style,
+    figure_to_png,
+    new_axes,
+    plot_histogram,
+    render_parallel,
+    sample_for_plot,
+)
+from modules.constants import (
+    BATCH_POLL_SECONDS,
+    MAX_CATEGORICAL_BARS,
+    MAX_CONCURRENT_REQUESTS,
+    OPENAI_MODEL,
+)
+from modules.data_loader import df_fingerprint
 from modules.schema_detector import SchemaInfo
 
+if TYPE_CHECKING:
+    from matplotlib.figure import Figure
+
 logger = logging.getLogger(__name__)
 
 _PROMPT_PATH = (
@@ -30,7 +49,18 @@ _COMMENTARY_PROMPT_PATH = (
     / "chart_commentary.txt"
 )
 
+# LRU of commentary keyed by (title, plot_type, description_for_ai) so
+# reruns do not re-query OpenAI for charts that were already explained.
+_COMMENTARY_CACHE: OrderedDict[tuple[str, str, str], str] = OrderedDict()
+_COMMENTARY_CACHE_SIZE = 256
+
+# OpenAI routes requests with the same prompt_cache_key together, which
+# raises the hit rate of its automatic prefix cache. Every commentary
+# request opens with the same system prompt.
+_COMMENTARY_CACHE_ROUTING_KEY = "chart-commentary"
+
 
+@lru_cache(maxsize=1)
 def _load_prompt_template() -> str:
     """Read the insightful-questions system prompt from disk.
 
@@ -43,7 +73,7 @@ def _load_prompt_template() -> str:
     return _PROMPT_PATH.read_text(encoding="utf-8")
 
 
-def _build_user_message(
+def build_user_message(
     schema_info: SchemaInfo,
     df: pd.DataFrame,
 ) -> str:
@@ -56,6 +86,9 @@ def _build_user_message(
     Returns:
         A formatted string for the OpenAI user message.
     """
+    # Sections run from most to least stable (schema, stats, sample
+    # rows) with fixed formatting, so repeated requests for the same
+    # data share the longest possible prefix for prompt caching.
     parts: list[str] = []
 
     # Column schema summary
@@ -75,16 +108,16 @@ def _build_user_message(
     num_cols = schema_info.numerical_cols
     if num_cols:
         parts.append("\n## Numerical Column Stats")
-        for col in num_cols:
-            if col in df.columns:
-                series = df[col].dropna()
-                if len(series) > 0:
-                    parts.append(
-                        f"- {col}: mean={series.mean():.4g}, "
-                        f"std={series.std():.4g}, "
-                        f"min={series.min():.4g}, "
-                        f"max={series.max():.4g}"
-                    )
+        present = [col for col in num_cols if col in df.columns]
+        present = [col for col in present if df[col].notna().any()]
+        stats = df[present].agg(["mean", "std", "min", "max"])
+        for col, col_stats in stats.items():
+            parts.append(
+                f"- {col}: mean={col_stats['mean']:.4g}, "
+                f"std={col_stats['std']:.4g}, "
+                f"min={col_stats['min']:.4g}, "
+                f"max={col_stats['max']:.4g}"
+            )
 
     # 5-row sample
     parts.append("\n## Sample Data (first 5 rows)")
@@ -93,54 +126,55 @@ def _build_user_message(
     return "\n".join(parts)
 
 
-def generate_questions(
-    schema_info: SchemaInfo,
-    df: pd.DataFrame,
-    api_key: str,
+async def generate_questions(
+    user_message: str,
+    columns: list[str],
+    data_key: str,
+    client: AsyncOpenAI,
 ) -> list[dict]:
     """Generate insightful analytical questions about the dataset.
 
     Reads a prompt template, sends schema and sample data to OpenAI,
-    and returns validated question dicts.
+    and returns validated question dicts. The caller builds the message
+    on the script thread, so this coroutine never touches the DataFrame
+    while it runs on the shared event loop.
 
     Args:
-        schema_info: Detected schema metadata.
-        df: The uploaded DataFrame.
-        api_key: OpenAI API key.
+        user_message: Schema, stats and sample rows from
+            ``build_user_message``.
+        columns: Column names of the DataFrame; questions naming any
+            other column are dropped.
+        data_key: Stable identifier of the loaded data, used to route
+            repeated requests for it to OpenAI's prompt cache.
+        client: Shared async OpenAI client.
 
     Returns:
         A list of question dicts, each containing: question,
         chart_type, x_column, y_column, group_column.
     """
     system_prompt = _load_prompt_template()
-    user_message = _build_user_message(schema_info, df)
+    cache_key = f"questions-{data_key}"
 
-    client = OpenAI(api_key=api_key)
-    response = client.chat.completions.create(
+    response = await client.chat.completions.create(
         model=OPENAI_MODEL,
-        response_format={"type": "json_object"},
+        response_format=_QUESTIONS_RESPONSE_FORMAT,
         messages=[
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_message},
         ],
         temperature=0.7,
+        extra_body={"prompt_cache_key": cache_key},
     )
 
+    # A refusal arrives with no content; strict mode guarantees the
+    # shape of everything else.
     content = response.choices[0].message.content or "{}"
-    raw = json.loads(content)
-    questions_raw = raw.get("questions", [])
-
-    if not isinstance(questions_raw, list):
-        logger.warning("OpenAI returned non-list questions: %s", type(questions_raw))
-        return []
+    questions_raw = json.loads(content).get("questions", [])
 
-    valid_columns = set(df.columns)
+    valid_columns = set(columns)
     valid_questions: list[dict] = []
 
     for q in questions_raw:
-        if not isinstance(q, dict):
-            continue
-
         x_col = q.get("x_column")
         y_col = q.get("y_column")
         group_col = q.get("group_column")
@@ -171,8 +205,8 @@ def generate_questions(
 
         valid_questions.append(
             {
-                "question": str(q.get("question", "")),
-                "chart_type": str(q.get("chart_type", "")),
+                "question": q["question"],
+                "chart_type": q["chart_type"],
                 "x_column": x_col,
                 "y_column": y_col,
                 "group_column": group_col,
@@ -216,13 +250,14 @@ def _build_description(
     for key in ("x_column", "y_column"):
         col = question.get(key)
         if col and col in df.columns:
-            series = df[col].dropna()
+            series = df[col]
             if pd.api.types.is_numeric_dtype(series):
+                stats = series.agg(["mean", "std", "min", "max"])
                 parts.append(
-                    f"{col}: mean={series.mean():.4g}, "
-                    f"std={series.std():.4g}, "
-                    f"min={series.min():.4g}, "
-                    f"max={series.max():.4g}"
+                    f"{col}: mean={stats['mean']:.4g}, "
+                    f"std={stats['std']:.4g}, "
+                    f"min={stats['min']:.4g}, "
+                    f"max={stats['max']:.4g}"
                 )
             else:
                 parts.append(
@@ -235,7 +270,7 @@ def _build_description(
 def _create_histogram(
     df: pd.DataFrame,
     x_column: str,
-) -> plt.Figure:
+) -> Figure:
     """Create a histogram with KDE for a numerical column.
 
     Args:
@@ -245,8 +280,8 @@ def _create_histogram(
     Returns:
         A matplotlib Figure.
     """
-    fig, ax = plt.subplots()
-    sns.histplot(data=df, x=x_column, kde=True, ax=ax)
+    fig, ax = new_axes()
+    plot_histogram(ax, sample_for_plot(df[x_column]))
     return fig
 
 
@@ -254,7 +289,7 @@ def _create_scatter(
     df: pd.DataFrame,
     x_column: str,
     y_column: str,
-) -> plt.Figure:
+) -> Figure:
     """Create a scatter plot for two numerical columns.
 
     Args:
@@ -265,9 +300,16 @@ def _create_scatter(
     Returns:
         A matplotlib Figure.
     """
-    fig, ax = plt.subplots()
+    import seaborn as sns
+
+    fig, ax = new_axes()
     sns.scatterplot(
-        data=df, x=x_column, y=y_column, alpha=0.6, ax=ax,
+        data=sample_for_plot(df[[x_column, y_column]]),
+        x=x_column,
+        y=y_column,
+        alpha=0.6,
+        rasterized=True,
+        ax=ax,
     )
     return fig
 
@@ -275,7 +317,7 @@ def _create_scatter(
 def _create_bar_chart(
     df: pd.DataFrame,
     x_column: str,
-) -> plt.Figure:
+) -> Figure:
     """Create a horizontal bar chart of value counts.
 
     Args:
@@ -287,10 +329,10 @@ def _create_bar_chart(
     """
     counts = (
         df[x_column]
-        .value_counts()
-        .head(MAX_CATEGORICAL_BARS)
+        .value_counts(sort=False)
+        .nlargest(MAX_CATEGORICAL_BARS)
     )
-    fig, ax = plt.subplots()
+    fig, ax = new_axes()
     counts.plot.barh(ax=ax)
     ax.set_xlabel("Count")
     ax.set_ylabel(x_column)
@@ -302,7 +344,7 @@ def _create_box_plot(
     df: pd.DataFrame,
     x_column: str,
     y_column: str | None,
-) -> plt.Figure:
+) -> Figure:
     """Create a box plot, optionally grouped by a categorical column.
 
     Args:
@@ -313,7 +355,9 @@ def _create_box_plot(
     Returns:
         A matplotlib Figure.
     """
-    fig, ax = plt.subplots()
+    import seaborn as sns
+
+    fig, ax = new_axes()
     if y_column:
         sns.boxplot(data=df, x=x_column, y=y_column, ax=ax)
     else:
@@ -325,7 +369,7 @@ def _create_grouped_bar(
     df: pd.DataFrame,
     x_column: str,
     y_column: str,
-) -> plt.Figure:
+) -> Figure:
     """Create a horizontal bar of mean y_column grouped by x_column.
 
     Args:
@@ -337,12 +381,12 @@ def _create_grouped_bar(
         A matplotlib Figure.
     """
     grouped = (
-        df.groupby(x_column)[y_column]
+        df.groupby(x_column, observed=True)[y_column]
         .mean()
+        .nlargest(MAX_CATEGORICAL_BARS)
         .sort_values(ascending=True)
-        .tail(MAX_CATEGORICAL_BARS)
     )
-    fig, ax = plt.subplots()
+    fig, ax = new_axes()
     grouped.plot.barh(ax=ax)
     ax.set_xlabel(f"Mean {y_column}")
     ax.set_ylabel(x_column)
@@ -367,7 +411,54 @@ _CHART_CREATORS = {
     ),
 }
 
+# Structured Outputs schema for generate_questions. In strict mode the
+# API only returns objects of this shape, and as a fixed part of every
+# request it is covered by OpenAI's prompt-prefix cache.
+_QUESTIONS_RESPONSE_FORMAT = {
+    "type": "json_schema",
+    "json_schema": {
+        "name": "questions",
+        "strict": True,
+        "schema": {
+            "type": "object",
+            "properties": {
+                "questions": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "question": {"type": "string"},
+                            "chart_type": {
+                                "type": "string",
+                                "enum": list(_CHART_CREATORS),
+                            },
+                            "x_column": {"type": "string"},
+                            "y_column": {"type": ["string", "null"]},
+                            "group_column": {"type": ["string", "null"]},
+                        },
+                        "required": [
+                            "question",
+                            "chart_type",
+                            "x_column",
+                            "y_column",
+                            "group_column",
+                        ],
+                        "additionalProperties": False,
+                    },
+                },
+            },
+            "required": ["questions"],
+            "additionalProperties": False,
+        },
+    },
+}
+
 
+@st.cache_resource(
+    show_spinner=False,
+    max_entries=4,
+    hash_funcs={pd.DataFrame: df_fingerprint},
+)
 def generate_insight_plots(
     df: pd.DataFrame,
     questions: list[dict],
@@ -383,51 +474,67 @@ def generate_insight_plots(
         question.
     """
     configure_plot_style()
-    results: list[PlotResult] = []
+    tasks: list[tuple] = []
 
     for question in questions:
         chart_type = question.get("chart_type", "")
-        creator = _CHART_CREATORS.get(chart_type)
-
-        if creator is None:
+        if chart_type not in _CHART_CREATORS:
             logger.warning(
                 "Unknown chart_type '%s', skipping", chart_type,
             )
             continue
 
-        try:
-            fig = creator(df, question)
-            title = _truncate_title(question["question"])
-            fig.suptitle(title, fontsize=11, y=1.02)
-            fig.tight_layout()
-
-            col_names: list[str] = []
-            for key in ("x_column", "y_column", "group_column"):
-                col = question.get(key)
-                if col:
-                    col_names.append(col)
-
-            plot_result = PlotResult(
-                figure=fig,
-                title=title,
-                plot_type=chart_type,
-                description_for_ai=_build_description(
-                    question, df,
-                ),
-                column_names=col_names,
-            )
-            results.append(plot_result)
+        col_names: list[str] = []
+        for key in ("x_column", "y_column", "group_column"):
+            col = question.get(key)
+            if col:
+                col_names.append(col)
 
-        except Exception:
-            logger.warning(
-                "Failed to create %s plot for: %s",
-                chart_type,
-                question.get("question", ""),
-                exc_info=True,
-            )
-            continue
+        # Ship only the referenced columns to the render worker.
+        present = [col for col in dict.fromkeys(col_names) if col in df.columns]
+        data = df[present]
+        tasks.append((_render_insight_plot, (data, question, col_names)))
 
-    return results
+    return [plot for plot in render_parallel(tasks) if plot is not None]
+
+
+def _render_insight_plot(
+    df: pd.DataFrame,
+    question: dict,
+    col_names: list[str],
+) -> PlotResult | None:
+    """Render the chart for one question into a PlotResult.
+
+    Top-level so it can run in a render worker process.
+
+    Args:
+        df: The columns of the uploaded DataFrame the question uses.
+        question: The question dict with chart metadata.
+        col_names: The columns referenced by the question.
+
+    Returns:
+        The rendered plot, or None if the chart could not be built.
+    """
+    chart_type = question["chart_type"]
+    try:
+        fig = _CHART_CREATORS[chart_type](df, question)
+        title = _truncate_title(question["question"])
+        fig.suptitle(title, fontsize=11, y=1.02)
+        return PlotResult(
+            png_bytes=figure_to_png(fig),
+            title=title,
+            plot_type=chart_type,
+            description_for_ai=_build_description(question, df),
+            column_names=col_names,
+        )
+    except Exception:
+        logger.warning(
+            "Failed to create %s plot for: %s",
+            chart_type,
+            question.get("question", ""),
+            exc_info=True,
+        )
+        return None
 
 
 # ------------------------------------------------------------------
@@ -435,6 +542,7 @@ def generate_insight_plots(
 # ------------------------------------------------------------------
 
 
+@lru_cache(maxsize=1)
 def _load_commentary_prompt() -> str:
     """Read the chart-commentary system prompt from disk.
 
@@ -475,15 +583,17 @@ def _build_chart_batch(
     return "\n\n".join(lines)
 
 
-def _call_commentary_api(
-    client: OpenAI,
+async def _call_commentary_api(
+    client: AsyncOpenAI,
+    semaphore: asyncio.Semaphore,
     system_prompt: str,
     user_message: str,
 ) -> dict[str, str]:
     """Call OpenAI for chart commentary with one retry.
 
     Args:
-        client: Configured OpenAI client.
+        client: Configured async OpenAI client.
+        semaphore: Caps the number of in-flight requests.
         system_prompt: The system prompt for commentary.
         user_message: The formatted chart batch message.
 
@@ -493,15 +603,19 @@ def _call_commentary_api(
     max_attempts = 2
     for attempt in range(max_attempts):
         try:
-            response = client.chat.completions.create(
-                model=OPENAI_MODEL,
-                response_format={"type": "json_object"},
-                messages=[
-                    {"role": "system", "content": system_prompt},
-                    {"role": "user", "content": user_message},
-                ],
-                temperature=0.7,
-            )
+            async with semaphore:
+                response = await client.chat.completions.create(
+                    model=OPENAI_MODEL,
+                    response_format={"type": "json_object"},
+                    messages=[
+                        {"role": "system", "content": system_prompt},
+                        {"role": "user", "content": user_message},
+                    ],
+                    temperature=0.7,
+                    extra_body={
+                        "prompt_cache_key": _COMMENTARY_CACHE_ROUTING_KEY,
+                    },
+                )
             content = (
                 response.choices[0].message.content or "{}"
             )
@@ -513,7 +627,7 @@ def _call_commentary_api(
                 logger.warning(
                     "Rate limit hit, retrying in %ds", wait,
                 )
-                time.sleep(wait)
+                await asyncio.sleep(wait)
             else:
                 logger.error(
                     "Commentary API call failed: %s", exc,
@@ -522,55 +636,197 @@ def _call_commentary_api(
     return {}
 
 
-def generate_batch_commentary(
+async def _run_commentary_batch_job(
+    client: AsyncOpenAI,
+    system_prompt: str,
+    user_messages: list[str],
+) -> list[dict[str, str]]:
+    """Get commentary for several chart batches via the OpenAI Batch API.
+
+    Uploads one JSONL request per message, submits a batch job and
+    polls it every ``BATCH_POLL_SECONDS`` until it finishes. Batch jobs
+    are billed at a discount but may take minutes to hours, so this
+    suits offline runs rather than interactive sessions.
+
+    Args:
+        client: Shared async OpenAI client.
+        system_prompt: The system prompt for commentary.
+        user_messages: One formatted chart batch message per request.
+
+    Returns:
+        One dict per message mapping chart index strings to commentary
+        strings; empty for requests that failed.
+    """
+    results: list[dict[str, str]] = [{} for _ in user_messages]
+    requests = [
+        {
+            "custom_id": str(i),
+            "method": "POST",
+            "url": "/v1/chat/completions",
+            "body": {
+                "model": OPENAI_MODEL,
+                "response_format": {"type": "json_object"},
+                "messages": [
+                    {"role": "system", "content": system_prompt},
+                    {"role": "user", "content": message},
+                ],
+                "temperature": 0.7,
+                "prompt_cache_key": _COMMENTARY_CACHE_ROUTING_KEY,
+            },
+        }
+        for i, message in enumerate(user_messages)
+    ]
+    payload = "\n".join(json.dumps(request) for request in requests)
+
+    try:
+        input_file = await client.files.create(
+            file=("commentary.jsonl", payload.encode("utf-8")),
+            purpose="batch",
+        )
+        batch = await client.batches.create(
+            input_file_id=input_file.id,
+            endpoint="/v1/chat/completions",
+            completion_window="24h",
+        )
+        while batch.status not in ("completed", "failed", "expired", "cancelled"):
+            await asyncio.sleep(BATCH_POLL_SECONDS)
+            batch = await client.batches.retrieve(batch.id)
+
+        if batch.status != "completed" or not batch.output_file_id:
+            logger.error(
+                "Commentary batch %s ended with status %s",
+                batch.id,
+                batch.status,
+            )
+            return results
+
+        output = await client.files.content(batch.output_file_id)
+    except Exception:
+        logger.exception("Commentary batch job failed")
+        return results
+
+    for line in output.text.splitlines():
+        try:
+            record = json.loads(line)
+            body = record["response"]["body"]
+            content = body["choices"][0]["message"]["content"] or "{}"
+            results[int(record["custom_id"])] = json.loads(content)
+        except (KeyError, IndexError, TypeError, ValueError):
+            logger.warning("Skipping malformed batch output line")
+    return results
+
+
+def _commentary_cache_key(
+    plot_result: PlotResult,
+) -> tuple[str, str, str]:
+    """Return the commentary cache key for a PlotResult.
+
+    Args:
+        plot_result: The chart to build a key for.
+
+    Returns:
+        A (title, plot_type, description_for_ai) tuple.
+    """
+    return (
+        plot_result.title,
+        plot_result.plot_type,
+        plot_result.description_for_ai,
+    )
+
+
+def _remember_commentary(
+    plot_result: PlotResult,
+    commentary: str,
+) -> None:
+    """Store commentary in the LRU cache, evicting the oldest entry.
+
+    Args:
+        plot_result: The chart the commentary belongs to.
+        commentary: The generated commentary string.
+    """
+    key = _commentary_cache_key(plot_result)
+    _COMMENTARY_CACHE[key] = commentary
+    _COMMENTARY_CACHE.move_to_end(key)
+    while len(_COMMENTARY_CACHE) > _COMMENTARY_CACHE_SIZE:
+        _COMMENTARY_CACHE.popitem(last=False)
+
+
+async def generate_batch_commentary(
     plot_results: list[PlotResult],
-    api_key: str,
-    batch_size: int = 10,
+    client: AsyncOpenAI,
+    batch_size: int = 1,
+    use_batch_api: bool = False,
 ) -> dict[str, str]:
     """Generate AI commentary for a list of chart PlotResults.
 
-    Sends chart metadata to OpenAI in batches and collects
-    commentary keyed by chart title.
+    Charts that were already explained are served from an in-memory
+    LRU cache. The rest are sent to OpenAI one request per batch,
+    with up to ``MAX_CONCURRENT_REQUESTS`` requests in flight at once,
+    and commentary is collected keyed by chart title.
 
     Args:
         plot_results: All PlotResult objects to generate
             commentary for.
-        api_key: OpenAI API key.
-        batch_size: Number of charts per API call.
-            Defaults to 10.
+        client: Shared async OpenAI client.
+        batch_size: Number of charts per API call. Defaults to 1,
+            so every chart is requested concurrently.
+        use_batch_api: Submit the requests as one OpenAI Batch API
+            job instead of live calls. Cheaper, but the job can take
+            far longer than an interactive session should wait.
 
     Returns:
         Dict mapping chart title to commentary string.
         Returns an empty dict if plot_results is empty or
         all API calls fail.
     """
-    if not plot_results:
-        return {}
+    title_map: dict[str, str] = {}
+    pending: list[PlotResult] = []
+    for plot_result in plot_results:
+        key = _commentary_cache_key(plot_result)
+        if key in _COMMENTARY_CACHE:
+            _COMMENTARY_CACHE.move_to_end(key)
+            title_map[plot_result.title] = _COMMENTARY_CACHE[key]
+        else:
+            pending.append(plot_result)
+
+    if not pending:
+        return title_map
 
     try:
         system_prompt = _load_commentary_prompt()
     except FileNotFoundError:
         logger.error("Commentary prompt file not found.")
-        return {}
+        return title_map
 
-    client = OpenAI(api_key=api_key)
-    title_map: dict[str, str] = {}
+    batch_starts = range(0, len(pending), batch_size)
+    user_messages = [
+        _build_chart_batch(pending[start : start + batch_size], start)
+        for start in batch_starts
+    ]
 
-    for batch_start in range(0, len(plot_results), batch_size):
-        batch = plot_results[
-            batch_start : batch_start + batch_size
-        ]
-        user_message = _build_chart_batch(batch, batch_start)
-        raw = _call_commentary_api(
-            client, system_prompt, user_message,
+    if use_batch_api:
+        responses = await _run_commentary_batch_job(
+            client, system_prompt, user_messages,
+        )
+    else:
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        responses = await asyncio.gather(
+            *(
+                _call_commentary_api(
+                    client, semaphore, system_prompt, message,
+                )
+                for message in user_messages
+            )
         )
 
+    for batch_start, raw in zip(batch_starts, responses):
+        batch = pending[batch_start : batch_start + batch_size]
         for idx_str, commentary in raw.items():
             try:
                 offset = int(idx_str) - batch_start - 1
                 if 0 <= offset < len(batch):
-                    title = batch[offset].title
-                    title_map[title] = str(commentary)
+                    title_map[batch[offset].title] = str(commentary)
+                    _remember_commentary(batch[offset], str(commentary))
             except (ValueError, IndexError):
                 logger.warning(
                     "Skipping invalid index '%s' in "
@@ -3,24 +3,36 @@
 from __future__ import annotations
 
 import logging
-from itertools import combinations
 
-import matplotlib.pyplot as plt
 import numpy as np
 import pandas as pd
 import seaborn as sns
-
-from modules.chart_helpers import PlotResult, configure_plot_style
+import streamlit as st
+
+from modules.chart_helpers import (
+    PlotResult,
+    configure_plot_style,
+    figure_to_png,
+    new_axes,
+    render_parallel,
+    sample_for_plot,
+)
 from modules.constants import (
     MAX_BIVARIATE_PLOTS,
     MAX_CATEGORICAL_BARS,
     MIN_CORRELATION_THRESHOLD,
 )
+from modules.data_loader import df_fingerprint
 from modules.schema_detector import SchemaInfo
 
 logger = logging.getLogger(__name__)
 
 
+@st.cache_resource(
+    show_spinner=False,
+    max_entries=4,
+    hash_funcs={pd.DataFrame: df_fingerprint},
+)
 def generate_bivariate_plots(
     df: pd.DataFrame,
     schema_info: SchemaInfo,
@@ -47,18 +59,19 @@ def generate_bivariate_plots(
     if len(numerical_cols) == 0:
         return []
 
-    results: list[PlotResult] = []
+    tasks: list[tuple] = []
     remaining = MAX_BIVARIATE_PLOTS
 
+    # One column-major float64 matrix shared by the correlation and
+    # eta-squared passes, instead of re-slicing the frame for each.
+    num_values = df[numerical_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+
     # --- Correlation heatmap (always first, if >= 2 numerical cols) ---
     corr: pd.DataFrame | None = None
     if len(numerical_cols) >= 2:
-        heatmap = _make_correlation_heatmap(df, numerical_cols)
-        if heatmap is not None:
-            results.append(heatmap)
-            remaining -= 1
-
-        corr = df[numerical_cols].corr()
+        corr = _pearson_corr(num_values, numerical_cols)
+        tasks.append((_make_correlation_heatmap, (corr,)))
+        remaining -= 1
 
     # --- Determine scatter / grouped-bar slot allocation ---
     max_scatter = min(4, remaining)
@@ -66,7 +79,7 @@ def generate_bivariate_plots(
 
     scatter_candidates = _rank_scatter_pairs(corr, numerical_cols)
     bar_candidates = _rank_grouped_bar_pairs(
-        df, categorical_cols, numerical_cols
+        df, categorical_cols, numerical_cols, num_values
     )
 
     n_scatter_available = min(len(scatter_candidates), max_scatter)
@@ -87,31 +100,18 @@ def generate_bivariate_plots(
         n_scatter = min(n_scatter_available, remaining // 2)
         n_bar = min(n_bar_available, remaining - n_scatter)
 
-    # --- Scatter plots ---
+    # --- Scatter plots (r is ranked on all rows, drawn on a sample) ---
     for col1, col2, r_val in scatter_candidates[:n_scatter]:
-        try:
-            plot = _make_scatter_plot(df, col1, col2, r_val)
-            results.append(plot)
-        except Exception:
-            logger.exception(
-                "Failed to create scatter plot for %s vs %s",
-                col1,
-                col2,
-            )
+        points = sample_for_plot(df[[col1, col2]])
+        tasks.append((_make_scatter_plot, (points, col1, col2, r_val)))
 
     # --- Grouped bar charts ---
     for cat_col, num_col, eta_sq in bar_candidates[:n_bar]:
-        try:
-            plot = _make_grouped_bar(df, cat_col, num_col, eta_sq)
-            results.append(plot)
-        except Exception:
-            logger.exception(
-                "Failed to create grouped bar for %s vs %s",
-                cat_col,
-                num_col,
-            )
+        tasks.append(
+            (_make_grouped_bar, (df[[cat_col, num_col]], cat_col, num_col, eta_sq))
+        )
 
-    return results
+    return [plot for plot in render_parallel(tasks) if plot is not None]
 
 
 # ------------------------------------------------------------------
@@ -119,22 +119,79 @@ def generate_bivariate_plots(
 # ------------------------------------------------------------------
 
 
-def _make_correlation_heatmap(
-    df: pd.DataFrame,
+def _pearson_corr(
+    num_values: np.ndarray,
     numerical_cols: list[str],
-) -> PlotResult | None:
+) -> pd.DataFrame:
+    """Compute pairwise Pearson correlations with matrix products.
+
+    Equivalent to ``df[numerical_cols].corr()`` (each pair uses the rows
+    where both values are present) but built from matrix products instead
+    of pandas' per-pair loop: a single float64 ``np.corrcoef`` when nothing
+    is missing, otherwise four float32 products over the masked,
+    mean-shifted data.
+
+    Args:
+        num_values: 2-D float array of the numerical columns, NaN
+            where missing.
+        numerical_cols: Names of the columns of ``num_values``.
+
+    Returns:
+        A square correlation DataFrame indexed by column name.
+    """
+    valid = ~np.isnan(num_values)
+    if len(num_values) > 1 and valid.all():
+        with np.errstate(divide="ignore", invalid="ignore"):
+            r = np.corrcoef(num_values, rowvar=False)
+    else:
+        r = _masked_pearson(num_values, valid)
+    r = np.clip(r.astype(np.float64, copy=False), -1.0, 1.0)
+    np.fill_diagonal(r, np.where(np.isnan(np.diag(r)), np.nan, 1.0))
+    return pd.DataFrame(r, index=numerical_cols, columns=numerical_cols)
+
+
+def _masked_pearson(values: np.ndarray, valid: np.ndarray) -> np.ndarray:
+    """Compute pairwise-complete Pearson correlations with float32 GEMMs.
+
+    Args:
+        values: 2-D float64 array with one column per variable.
+        valid: Boolean mask of the non-NaN entries of ``values``.
+
+    Returns:
+        The (unclipped) correlation matrix.
+    """
+    # Shifting by the column mean leaves r unchanged. Doing it in float64
+    # before narrowing keeps columns with a large offset (e.g. 1e7 + x)
+    # from losing their variation to float32 rounding, and keeps the
+    # float32 sums below from cancelling catastrophically.
+    shift = np.nansum(values, axis=0) / np.maximum(valid.sum(axis=0), 1)
+    centered = np.where(valid, values - shift, 0.0).astype(np.float32)
+    mask = valid.astype(np.float32)
+
+    n = mask.T @ mask
+    sum_x = centered.T @ mask  # sum of column i over rows shared with j
+    sum_sq = (centered * centered).T @ mask
+    sum_xy = centered.T @ centered
+
+    cov = n * sum_xy - sum_x * sum_x.T
+    var = n * sum_sq
+    var_x = var - sum_x * sum_x
+    with np.errstate(divide="ignore", invalid="ignore"):
+        return cov / np.sqrt(var_x * var_x.T)
+
+
+def _make_correlation_heatmap(corr: pd.DataFrame) -> PlotResult | None:
     """Create a correlation heatmap for numerical columns.
 
     Args:
-        df: The loaded DataFrame.
-        numerical_cols: List of numerical column names.
+        corr: Correlation matrix of the numerical columns.
 
     Returns:
         A PlotResult containing the heatmap, or None on failure.
     """
+    numerical_cols = list(corr.columns)
     try:
-        corr = df[numerical_cols].corr()
-        fig, ax = plt.subplots(figsize=(10, 8))
+        fig, ax = new_axes(figsize=(10, 8))
         annot = len(numerical_cols) <= 15
         sns.heatmap(
             corr,
@@ -145,12 +202,12 @@ def _make_correlation_heatmap(
             ax=ax,
         )
         ax.set_title("Correlation Heatmap")
-        plt.tight_layout()
+        fig.subplots_adjust(left=0.15, right=0.95, top=0.9, bottom=0.15)
 
         desc = _top_correlated_pairs_description(corr)
 
         return PlotResult(
-            figure=fig,
+            png_bytes=figure_to_png(fig),
             title="Correlation Heatmap",
             plot_type="heatmap",
             description_for_ai=desc,
@@ -174,15 +231,7 @@ def _top_correlated_pairs_description(
     Returns:
         Human-readable string listing the top correlated pairs.
     """
-    pairs: list[tuple[str, str, float]] = []
-    cols = corr.columns.tolist()
-    for i, j in combinations(range(len(cols)), 2):
-        r_val = corr.iloc[i, j]
-        if not np.isnan(r_val):
-            pairs.append((cols[i], cols[j], r_val))
-
-    pairs.sort(key=lambda x: abs(x[2]), reverse=True)
-    top_pairs = pairs[:top_n]
+    top_pairs = _ranked_pairs(corr)[:top_n]
 
     if not top_pairs:
         return "No significant correlations found."
@@ -212,21 +261,45 @@ def _rank_scatter_pairs(
     if corr is None or len(numerical_cols) < 2:
         return []
 
-    pairs: list[tuple[str, str, float]] = []
-    cols = corr.columns.tolist()
-    for i, j in combinations(range(len(cols)), 2):
-        r_val = corr.iloc[i, j]
-        if not np.isnan(r_val) and abs(r_val) >= MIN_CORRELATION_THRESHOLD:
-            pairs.append((cols[i], cols[j], r_val))
+    return _ranked_pairs(corr, min_abs_r=MIN_CORRELATION_THRESHOLD)
 
-    pairs.sort(key=lambda x: abs(x[2]), reverse=True)
-    return pairs
+
+def _ranked_pairs(
+    corr: pd.DataFrame,
+    min_abs_r: float = 0.0,
+) -> list[tuple[str, str, float]]:
+    """List the distinct column pairs of a correlation matrix by |r|.
+
+    Reads the upper triangle of the matrix in one vectorized step
+    rather than indexing each pair.
+
+    Args:
+        corr: Correlation matrix DataFrame.
+        min_abs_r: Minimum |r| for a pair to be included.
+
+    Returns:
+        (col1, col2, r) tuples, descending by |r|, skipping NaNs. Ties
+        keep the matrix order.
+    """
+    values = corr.to_numpy()
+    rows, cols = np.triu_indices(values.shape[0], k=1)
+    r = values[rows, cols]
+    keep = ~np.isnan(r) & (np.abs(r) >= min_abs_r)
+    rows, cols, r = rows[keep], cols[keep], r[keep]
+    order = np.argsort(-np.abs(r), kind="stable")
+
+    names = corr.columns.tolist()
+    return [
+        (names[rows[k]], names[cols[k]], float(r[k]))
+        for k in order
+    ]
 
 
 def _rank_grouped_bar_pairs(
     df: pd.DataFrame,
     categorical_cols: list[str],
     numerical_cols: list[str],
+    num_values: np.ndarray,
 ) -> list[tuple[str, str, float]]:
     """Rank (categorical, numerical) pairs by eta-squared.
 
@@ -234,6 +307,8 @@ def _rank_grouped_bar_pairs(
         df: The loaded DataFrame.
         categorical_cols: List of categorical column names.
         numerical_cols: List of numerical column names.
+        num_values: 2-D float64 array of ``numerical_cols``, NaN
+            where missing.
 
     Returns:
         Sorted list of (cat_col, num_col, eta_squared) tuples,
@@ -244,64 +319,91 @@ def _rank_grouped_bar_pairs(
 
     pairs: list[tuple[str, str, float]] = []
     for cat_col in categorical_cols:
-        for num_col in numerical_cols:
-            eta_sq = _compute_eta_squared(df, cat_col, num_col)
-            if eta_sq is not None:
-                pairs.append((cat_col, num_col, eta_sq))
+        eta_sq = _eta_squared_by_column(
+            df[cat_col], num_values, numerical_cols
+        )
+        for num_col, value in eta_sq.items():
+            if not np.isnan(value):
+                pairs.append((cat_col, num_col, float(value)))
 
     pairs.sort(key=lambda x: x[2], reverse=True)
     return pairs
 
 
-def _compute_eta_squared(
-    df: pd.DataFrame,
-    cat_col: str,
-    num_col: str,
-) -> float | None:
-    """Compute eta-squared for a categorical-numerical pair.
+def _eta_squared_by_column(
+    groups: pd.Series,
+    num_values: np.ndarray,
+    numerical_cols: list[str],
+) -> pd.Series:
+    """Compute eta-squared of every numerical column against one grouping.
 
-    Eta-squared = SS_between / SS_total, measuring the proportion
-    of variance in the numerical column explained by group
-    membership in the categorical column.
+    The categorical column is factorized once and each numerical column
+    is reduced against the shared group codes by ``_eta_squared_kernel``.
 
     Args:
-        df: The loaded DataFrame.
-        cat_col: Name of the categorical column.
-        num_col: Name of the numerical column.
+        groups: The categorical column.
+        num_values: 2-D float64 array of the numerical columns, NaN
+            where missing.
+        numerical_cols: Names of the columns of ``num_values``.
 
     Returns:
-        Eta-squared value, or None if computation fails.
+        Eta-squared per numerical column; NaN where fewer than two
+        groups have data or the computation fails.
     """
     try:
-        subset = df[[cat_col, num_col]].dropna()
-        if subset.empty:
-            return None
-
-        groups = [
-            group[num_col].values
-            for _, group in subset.groupby(cat_col)
-        ]
-        # Need at least 2 groups with data
-        groups = [g for g in groups if len(g) > 0]
-        if len(groups) < 2:
-            return None
-
-        grand_mean = subset[num_col].mean()
-        ss_total = float(np.sum((subset[num_col] - grand_mean) ** 2))
-        if ss_total == 0:
-            return 0.0
-
-        ss_between = sum(
-            len(g) * (np.mean(g) - grand_mean) ** 2 for g in groups
+        codes, uniques = pd.factorize(groups)
+        return pd.Series(
+            [
+                _eta_squared_kernel(codes, num_values[:, j], len(uniques))
+                for j in range(len(numerical_cols))
+            ],
+            index=numerical_cols,
+            dtype=np.float64,
         )
-        return float(ss_between / ss_total)
     except Exception:
-        logger.exception(
-            "Failed to compute eta-squared for %s vs %s",
-            cat_col,
-            num_col,
-        )
-        return None
+        logger.exception("Failed to compute eta-squared for %s", groups.name)
+        return pd.Series(np.nan, index=numerical_cols)
+
+
+def _eta_squared_kernel(
+    codes: np.ndarray,
+    values: np.ndarray,
+    n_groups: int,
+) -> float:
+    """Compute eta-squared for one numerical column from group codes.
+
+    Eta-squared = SS_between / SS_total, measuring the proportion
+    of variance in the numerical column explained by group
+    membership. Per-group counts and sums come from ``np.bincount``,
+    so the cost is linear in rows regardless of the number of groups.
+
+    Args:
+        codes: Group code per row (-1 for a missing group).
+        values: Numerical value per row (NaN when missing).
+        n_groups: Number of distinct group codes.
+
+    Returns:
+        Eta-squared over the rows where both are present, or NaN if
+        fewer than two groups have data.
+    """
+    keep = (codes >= 0) & ~np.isnan(values)
+    if not keep.all():  # clean columns skip the filtering copies
+        codes, values = codes[keep], values[keep]
+    counts = np.bincount(codes, minlength=n_groups)
+    # Need at least 2 groups with data
+    if np.count_nonzero(counts) < 2:
+        return np.nan
+
+    grand_mean = values.mean()
+    ss_total = float(np.sum((values - grand_mean) ** 2))
+    if ss_total == 0:
+        return 0.0
+
+    sums = np.bincount(codes, weights=values, minlength=n_groups)
+    present = counts > 0
+    group_means = sums[present] / counts[present]
+    ss_between = float(np.sum(counts[present] * (group_means - grand_mean) ** 2))
+    return ss_between / ss_total
 
 
 def _make_scatter_plot(
@@ -309,35 +411,44 @@ def _make_scatter_plot(
     col1: str,
     col2: str,
     r_val: float,
-) -> PlotResult:
+) -> PlotResult | None:
     """Create a scatter plot for two numerical columns.
 
     Args:
-        df: The loaded DataFrame.
+        df: DataFrame holding at least the two plotted columns.
         col1: Name of the x-axis column.
         col2: Name of the y-axis column.
         r_val: Pre-computed Pearson correlation coefficient.
 
     Returns:
-        A PlotResult containing the scatter plot.
+        A PlotResult containing the scatter plot, or None on failure.
     """
-    fig, ax = plt.subplots()
-    sns.scatterplot(data=df, x=col1, y=col2, alpha=0.6, ax=ax)
-    ax.set_title(f"{col1} vs {col2}")
-    plt.tight_layout()
-
-    desc = (
-        f"Scatter plot of {col1} vs {col2}. "
-        f"Pearson correlation r = {r_val:.2f}."
-    )
+    try:
+        fig, ax = new_axes()
+        sns.scatterplot(
+            data=df, x=col1, y=col2, alpha=0.6, rasterized=True, ax=ax,
+        )
+        ax.set_title(f"{col1} vs {col2}")
 
-    return PlotResult(
-        figure=fig,
-        title=f"{col1} vs {col2}",
-        plot_type="scatter",
-        description_for_ai=desc,
-        column_names=[col1, col2],
-    )
+        desc = (
+            f"Scatter plot of {col1} vs {col2}. "
+            f"Pearson correlation r = {r_val:.2f}."
+        )
+
+        return PlotResult(
+            png_bytes=figure_to_png(fig),
+            title=f"{col1} vs {col2}",
+            plot_type="scatter",
+            description_for_ai=desc,
+            column_names=[col1, col2],
+        )
+    except Exception:
+        logger.exception(
+            "Failed to create scatter plot for %s vs %s",
+            col1,
+            col2,
+        )
+        return None
 
 
 def _make_grouped_bar(
@@ -345,48 +456,54 @@ def _make_grouped_bar(
     cat_col: str,
     num_col: str,
     eta_sq: float,
-) -> PlotResult:
+) -> PlotResult | None:
     """Create a horizontal grouped bar chart.
 
     Shows the mean of a numerical column grouped by the top
     categories (limited to MAX_CATEGORICAL_BARS).
 
     Args:
-        df: The loaded DataFrame.
+        df: DataFrame holding at least the two plotted columns.
         cat_col: Name of the categorical column.
         num_col: Name of the numerical column.
         eta_sq: Pre-computed eta-squared value.
 
     Returns:
-        A PlotResult containing the grouped bar chart.
+        A PlotResult containing the grouped bar chart, or None on
+        failure.
     """
-    means = (
-        df.groupby(cat_col)[num_col]
-        .mean()
-        .dropna()
-        .sort_values(ascending=False)
-        .head(MAX_CATEGORICAL_BARS)
-    )
+    try:
+        means = (
+            df.groupby(cat_col, observed=True)[num_col]
+            .mean()
+            .nlargest(MAX_CATEGORICAL_BARS)
+        )
 
-    fig, ax = plt.subplots()
-    means.sort_values(ascending=True).plot.barh(ax=ax)
-    ax.set_title(f"{cat_col} vs {num_col}")
-    ax.set_xlabel(num_col)
-    ax.set_ylabel(cat_col)
-    plt.tight_layout()
-
-    top_cats = means.index.tolist()[:5]
-    top_cats_str = ", ".join(str(c) for c in top_cats)
-    desc = (
-        f"Grouped bar chart of mean {num_col} by {cat_col}. "
-        f"Eta-squared = {eta_sq:.3f}. "
-        f"Top categories: {top_cats_str}."
-    )
+        fig, ax = new_axes()
+        means.sort_values(ascending=True).plot.barh(ax=ax)
+        ax.set_title(f"{cat_col} vs {num_col}")
+        ax.set_xlabel(num_col)
+        ax.set_ylabel(cat_col)
+
+        top_cats = means.index.tolist()[:5]
+        top_cats_str = ", ".join(str(c) for c in top_cats)
+        desc = (
+            f"Grouped bar chart of mean {num_col} by {cat_col}. "
+            f"Eta-squared = {eta_sq:.3f}. "
+            f"Top categories: {top_cats_str}."
+        )
 
-    return PlotResult(
-        figure=fig,
-        title=f"{cat_col} vs {num_col}",
-        plot_type="grouped_bar",
-        description_for_ai=desc,
-        column_names=[cat_col, num_col],
-    )
+        return PlotResult(
+            png_bytes=figure_to_png(fig),
+            title=f"{cat_col} vs {num_col}",
+            plot_type="grouped_bar",
+            description_for_ai=desc,
+            column_names=[cat_col, num_col],
+        )
+    except Exception:
+        logger.exception(
+            "Failed to create grouped bar for %s vs %s",
+            cat_col,
+            num_col,
+        )
+        return None
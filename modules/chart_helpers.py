@@ -1,26 +1,69 @@
-"""Shared matplotlib/seaborn styling and PlotResult dataclass."""
+"""Shared matplotlib/seaborn styling, PlotResult dataclass and render pool."""
 
 from __future__ import annotations
 
+import hashlib
+import logging
+import multiprocessing
 import os
 import re
+import threading
+from collections.abc import Callable
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
 from dataclasses import dataclass, field
+from io import BytesIO
+from typing import TYPE_CHECKING, Any, TypeVar
 
 import matplotlib
-import matplotlib.pyplot as plt
-import seaborn as sns
+import numpy as np
+import pandas as pd
 
-from modules.constants import OUTPUT_DIR, PLOT_SAVE_DPI
+from modules.constants import (
+    HISTOGRAM_BINS,
+    KDE_GRID_SIZE,
+    MAX_PLOT_POINTS,
+    MAX_RENDER_WORKERS,
+    OUTPUT_DIR,
+    PLOT_SAVE_DPI,
+    RANDOM_SEED,
+)
 
-# Use non-interactive backend so figures don't pop up outside Streamlit
+if TYPE_CHECKING:
+    from matplotlib.axes import Axes
+    from matplotlib.figure import Figure
+
+# Use non-interactive backend so figures don't pop up outside Streamlit.
+# pyplot and seaborn are imported only where a plot is drawn, so pages
+# that never render a chart skip their start-up cost.
 matplotlib.use("Agg")
 
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_render_pool: ProcessPoolExecutor | None = None
+_render_pool_lock = threading.Lock()
+
+# One reusable figure per thread; see new_axes().
+_thread_figure = threading.local()
+
+_FILENAME_SANITIZE_RE = re.compile(r"[^a-z0-9]+")
+
+# Output directories already created by save_plot() in this process.
+_created_dirs: set[str] = set()
+# Digest of the bytes save_plot() last wrote to each path. Filenames
+# depend only on the plot title, so plots of different datasets can
+# share a path.
+_saved_digests: dict[str, bytes] = {}
+_save_lock = threading.Lock()
+
 
 @dataclass
 class PlotResult:
-    """Container for a generated matplotlib figure and its metadata."""
+    """Container for a rendered plot (PNG bytes) and its metadata."""
 
-    figure: plt.Figure
+    png_bytes: bytes
     title: str
     plot_type: str  # e.g. "histogram", "bar_chart", "scatter", "heatmap"
     description_for_ai: str = ""
@@ -30,6 +73,9 @@ class PlotResult:
 
 def configure_plot_style() -> None:
     """Apply a consistent seaborn/matplotlib style for all plots."""
+    import matplotlib.pyplot as plt
+    import seaborn as sns
+
     plt.style.use("seaborn-v0_8-whitegrid")
     sns.set_palette("Set2")
     plt.rcParams["figure.dpi"] = 100
@@ -37,8 +83,216 @@ def configure_plot_style() -> None:
     plt.rcParams["figure.figsize"] = (6, 4)
 
 
+def sample_for_plot(data: pd.DataFrame | pd.Series) -> pd.DataFrame | pd.Series:
+    """Cap the rows drawn in a point-level chart at MAX_PLOT_POINTS.
+
+    Rasterizing beyond ~10k points costs time without visibly changing
+    a histogram or scatter plot. Statistics shown alongside a chart
+    should still be computed on the full data.
+
+    Args:
+        data: The rows to be plotted.
+
+    Returns:
+        ``data`` itself, or a reproducible random sample of it.
+    """
+    if len(data) <= MAX_PLOT_POINTS:
+        return data
+    return data.sample(n=MAX_PLOT_POINTS, random_state=RANDOM_SEED)
+
+
+def plot_histogram(
+    ax: Axes,
+    values: pd.Series,
+    bins: int = HISTOGRAM_BINS,
+) -> None:
+    """Draw a count histogram with a KDE overlay, styled like seaborn's.
+
+    Equivalent in appearance to ``sns.histplot(x=values, kde=True)``,
+    but the bins come straight from ``np.histogram`` and go to a single
+    ``ax.bar`` call, skipping seaborn's long-form data handling.
+
+    Args:
+        ax: Axes to draw on.
+        values: The values to plot; missing values are ignored. The
+            Series name labels the x-axis.
+        bins: Number of equal-width bins.
+    """
+    from matplotlib.colors import to_rgba
+
+    x = pd.Series(values).to_numpy(dtype=np.float64, na_value=np.nan)
+    x = x[np.isfinite(x)]
+    counts, edges = np.histogram(x, bins=bins)
+    widths = np.diff(edges)
+    bars = ax.bar(
+        edges[:-1],
+        counts,
+        widths,
+        align="edge",
+        facecolor=to_rgba("C0", 0.5),
+        edgecolor=matplotlib.rcParams["patch.edgecolor"],
+    )
+    for bar in bars:
+        bar.sticky_edges.y[:] = [0]
+
+    # Like seaborn, keep bar outlines thin relative to the bar width.
+    ax.autoscale_view()
+    start, end = ax.transData.transform([[edges[0], 0], [edges[0] + widths[0], 0]])
+    width_points = 72 / ax.figure.dpi * abs(end[0] - start[0])
+    linewidth = min(0.1 * width_points, matplotlib.rcParams["patch.linewidth"])
+    for bar in bars:
+        bar.set_linewidth(linewidth)
+
+    ax.set_xlabel("" if getattr(values, "name", None) is None else values.name)
+    ax.set_ylabel("Count")
+    plot_kde(ax, x, bins)
+
+
+def plot_kde(
+    ax: Axes,
+    values: pd.Series | np.ndarray,
+    bins: int = HISTOGRAM_BINS,
+) -> None:
+    """Overlay a Gaussian KDE on a count histogram of ``values``.
+
+    Stands in for ``sns.histplot(..., kde=True)``, which evaluates the
+    kernel at every grid point for every sample. Here the samples are
+    binned onto KDE_GRID_SIZE points and the bins are convolved with the
+    kernel, so the cost no longer grows with rows times grid points. The
+    bandwidth (Scott's rule) and count scaling match seaborn's curve.
+
+    Args:
+        ax: Axes already holding the histogram.
+        values: The plotted values; missing values are ignored.
+        bins: Number of equal-width bins in the histogram.
+    """
+    x = pd.Series(values).to_numpy(dtype=np.float64, na_value=np.nan)
+    x = x[np.isfinite(x)]
+    n = len(x)
+    if n < 2:
+        return
+    lo, hi = x.min(), x.max()
+    bandwidth = x.std(ddof=1) * n ** (-1 / 5)
+    if hi == lo or bandwidth == 0:
+        return
+
+    counts, edges = np.histogram(x, bins=KDE_GRID_SIZE, range=(lo, hi))
+    step = edges[1] - edges[0]
+    half = int(np.ceil(4 * bandwidth / step))
+    offsets = np.arange(-half, half + 1) * step
+    kernel = np.exp(-0.5 * (offsets / bandwidth) ** 2)
+    kernel /= bandwidth * np.sqrt(2 * np.pi)
+    smoothed = np.convolve(counts, kernel, mode="full")[half:half + len(counts)]
+
+    # Scale the density (smoothed / n) to the histogram's counts.
+    bin_width = (hi - lo) / bins
+    color = ax.patches[0].get_facecolor()[:3] if ax.patches else None
+    ax.plot(edges[:-1] + step / 2, smoothed * bin_width, color=color)
+
+
+def new_axes(
+    figsize: tuple[float, float] | None = None,
+) -> tuple[Figure, Axes]:
+    """Return this thread's reusable figure, cleared, with one subplot.
+
+    Allocating a fresh pyplot figure per chart dominates the cost of
+    small plots, so each thread keeps a single figure outside pyplot's
+    registry and clears it between charts. The previous chart must be
+    rasterized with ``figure_to_png`` before calling this again.
+
+    Args:
+        figsize: Figure size in inches; defaults to the style's size.
+
+    Returns:
+        A (figure, axes) pair ready for plotting.
+    """
+    from matplotlib.figure import Figure
+
+    fig = getattr(_thread_figure, "figure", None)
+    if fig is None:
+        fig = Figure()
+        _thread_figure.figure = fig
+    fig.clear()
+    fig.set_size_inches(figsize or matplotlib.rcParams["figure.figsize"])
+    return fig, fig.add_subplot()
+
+
+def figure_to_png(fig: Figure) -> bytes:
+    """Rasterize a figure to PNG bytes.
+
+    Rendering once at generation time lets cached plots be redrawn on
+    every rerun without going through matplotlib again.
+
+    Args:
+        fig: The figure to render.
+
+    Returns:
+        The PNG-encoded image.
+    """
+    buf = BytesIO()
+    fig.savefig(buf, format="png", dpi=PLOT_SAVE_DPI, bbox_inches="tight")
+    return buf.getvalue()
+
+
+def _get_render_pool() -> ProcessPoolExecutor | None:
+    """Return the shared plot-rendering process pool, creating it lazily.
+
+    Workers are spawned rather than forked because the Streamlit server
+    is multithreaded, and forking it can deadlock on locks held by other
+    threads. Each worker applies the plot style once at start-up.
+
+    Returns:
+        The pool, or None on single-core hosts where it cannot help.
+    """
+    global _render_pool
+    workers = min(os.cpu_count() or 1, MAX_RENDER_WORKERS)
+    if workers < 2:
+        return None
+    with _render_pool_lock:
+        if _render_pool is None:
+            _render_pool = ProcessPoolExecutor(
+                max_workers=workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=configure_plot_style,
+            )
+        return _render_pool
+
+
+def render_parallel(
+    tasks: list[tuple[Callable[..., T], tuple[Any, ...]]],
+) -> list[T]:
+    """Run independent plot-rendering tasks across worker processes.
+
+    Each task is a top-level (picklable) function and its arguments.
+    Pass column arrays or small sub-frames rather than the full
+    DataFrame to keep pickling cheap. Tasks run in-process when no
+    pool is available or the pool breaks.
+
+    Args:
+        tasks: ``(function, args)`` pairs to execute.
+
+    Returns:
+        The task results, in the same order as ``tasks``.
+    """
+    global _render_pool
+    pool = _get_render_pool() if len(tasks) > 1 else None
+    if pool is not None:
+        try:
+            futures = [pool.submit(func, *args) for func, args in tasks]
+            return [future.result() for future in futures]
+        except BrokenProcessPool:
+            logger.exception("Render pool failed; rendering in-process")
+            with _render_pool_lock:
+                _render_pool = None
+    return [func(*args) for func, args in tasks]
+
+
 def save_plot(plot_result: PlotResult, subfolder: str) -> str:
-    """Save a PlotResult's figure to disk as PNG.
+    """Save a PlotResult's PNG image to disk.
+
+    Plots are cached across reruns, so a path that already holds the
+    same image is not written again, and each output directory is
+    created once per process (again if it has since been removed).
 
     Args:
         plot_result: The plot to save.
@@ -48,12 +302,33 @@ def save_plot(plot_result: PlotResult, subfolder: str) -> str:
         The absolute path to the saved PNG file.
     """
     dir_path = os.path.join(OUTPUT_DIR, subfolder)
-    os.makedirs(dir_path, exist_ok=True)
-
-    sanitized = re.sub(r"[^a-z0-9]+", "_", plot_result.title.lower()).strip("_")
+    sanitized = _FILENAME_SANITIZE_RE.sub("_", plot_result.title.lower()).strip("_")
     filename = f"{sanitized}.png"
     filepath = os.path.join(dir_path, filename)
 
-    plot_result.figure.savefig(filepath, dpi=PLOT_SAVE_DPI, bbox_inches="tight")
+    digest = hashlib.blake2b(plot_result.png_bytes, digest_size=16).digest()
+    with _save_lock:
+        if _saved_digests.get(filepath) != digest or not os.path.isfile(filepath):
+            if dir_path not in _created_dirs:
+                os.makedirs(dir_path, exist_ok=True)
+                _created_dirs.add(dir_path)
+            try:
+                _write_bytes(filepath, plot_result.png_bytes)
+            except FileNotFoundError:
+                # The directory was removed while the server was running
+                os.makedirs(dir_path, exist_ok=True)
+                _write_bytes(filepath, plot_result.png_bytes)
+            _saved_digests[filepath] = digest
     plot_result.saved_path = filepath
     return filepath
+
+
+def _write_bytes(path: str, data: bytes) -> None:
+    """Write bytes to a file, replacing any existing contents.
+
+    Args:
+        path: Destination file path.
+        data: Bytes to write.
+    """
+    with open(path, "wb") as f:
+        f.write(data)
@@ -4,18 +4,29 @@
 MAX_ROWS_DEFAULT = 10000
 MAX_COLUMNS = 50
 RANDOM_SEED = 42
+MAX_CATEGORY_UNIQUE_RATIO = 0.5
 
 # Schema detection
 MAX_UNIQUE_FOR_CATEGORICAL = 20
+DATETIME_SAMPLE_ROWS = 32
+DATETIME_MIN_PARSED_RATIO = 0.9
 
 # Plot limits
 MAX_UNIVARIATE_PLOTS = 9
 MAX_BIVARIATE_PLOTS = 9
 MAX_CATEGORICAL_BARS = 15
 MIN_CORRELATION_THRESHOLD = 0.3
+MAX_PLOT_POINTS = 10000
+HISTOGRAM_BINS = 64
+KDE_GRID_SIZE = 200
+
+# Plot rendering
+MAX_RENDER_WORKERS = 8
 
 # OpenAI
 OPENAI_MODEL = "gpt-4o-mini"
+MAX_CONCURRENT_REQUESTS = 8
+BATCH_POLL_SECONDS = 10
 
 # Output
 OUTPUT_DIR = "output"
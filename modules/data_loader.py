@@ -2,26 +2,212 @@
 
 from __future__ import annotations
 
+import codecs
+import hashlib
 from io import BytesIO
 
+import numpy as np
 import pandas as pd
 import streamlit as st
 
-from modules.constants import MAX_COLUMNS, MAX_ROWS_DEFAULT, RANDOM_SEED
+from modules.constants import (
+    MAX_CATEGORY_UNIQUE_RATIO,
+    MAX_COLUMNS,
+    MAX_ROWS_DEFAULT,
+    RANDOM_SEED,
+)
 
+try:
+    import pyarrow as pa
+    from pyarrow import compute as pc
+    from pyarrow import csv as pa_csv
+except ImportError:  # PyArrow is optional; fall back to the pandas parser
+    pa = None
+    pc = None
+    pa_csv = None
 
-@st.cache_data(show_spinner="Loading CSV...")
+# Bytes handed to each PyArrow parser thread.
+_ARROW_BLOCK_SIZE = 8 << 20
+
+# pandas' default missing-value markers; PyArrow's list lacks "None"
+# and "<NA>".
+_PANDAS_NA_VALUES = [
+    "", "#N/A", "#N/A N/A", "#NA", "-1.#IND", "-1.#QNAN", "-NaN", "-nan",
+    "1.#IND", "1.#QNAN", "<NA>", "N/A", "NA", "NULL", "NaN", "None",
+    "n/a", "nan", "null",
+]
+
+# Magnitude from which an integer literal no longer fits in int64.
+_INT64_LIMIT = 2.0**63
+
+# Bytes decoded per step while checking that a file is valid UTF-8.
+_UTF8_CHECK_CHUNK = 1 << 20
+
+
+def file_digest(file_bytes: bytes | memoryview) -> str:
+    """Return a BLAKE2b content key for raw file bytes.
+
+    Computed once per rerun and passed to ``load_csv`` in place of the
+    bytes themselves, so Streamlit never hashes the file contents.
+
+    Args:
+        file_bytes: Raw bytes (or a zero-copy view) of the uploaded file.
+
+    Returns:
+        A 32-character hex digest of the file contents.
+    """
+    return hashlib.blake2b(file_bytes, digest_size=16).hexdigest()
+
+
+def df_fingerprint(df: pd.DataFrame) -> tuple[bytes, tuple[int, int]]:
+    """Return a cheap content fingerprint for a DataFrame.
+
+    Used as a ``hash_funcs`` entry so Streamlit caches keyed on a loaded
+    DataFrame hash its row values once with pandas' vectorised hasher
+    instead of walking the frame with the default hasher.
+
+    Args:
+        df: The DataFrame to fingerprint.
+
+    Returns:
+        A tuple of (BLAKE2b digest of row hashes and column names, shape).
+    """
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(pd.util.hash_pandas_object(df, index=True).to_numpy())
+    digest.update("\x1f".join(map(str, df.columns)).encode("utf-8"))
+    return digest.digest(), df.shape
+
+
+def _detect_encoding(file_bytes: bytes | memoryview) -> str:
+    """Choose the encoding to parse a file with: utf-8, else latin-1.
+
+    Validating UTF-8 in chunks runs far faster than a CSV parse, so a
+    latin-1 file is parsed once instead of failing a utf-8 parse first.
+
+    Args:
+        file_bytes: Raw bytes (or a zero-copy view) of the uploaded file.
+
+    Returns:
+        ``"utf-8"`` if the whole file decodes as UTF-8, else ``"latin-1"``.
+    """
+    view = memoryview(file_bytes)
+    decoder = codecs.getincrementaldecoder("utf-8")()
+    try:
+        for start in range(0, len(view), _UTF8_CHECK_CHUNK):
+            decoder.decode(view[start:start + _UTF8_CHECK_CHUNK])
+        decoder.decode(b"", final=True)
+    except UnicodeDecodeError:
+        return "latin-1"
+    return "utf-8"
+
+
+def _arrow_table(
+    file_bytes: bytes | memoryview,
+    encoding: str,
+    column_types: dict[str, pa.DataType] | None = None,
+) -> pa.Table:
+    """Parse CSV bytes into an Arrow table with pandas-like options.
+
+    Args:
+        file_bytes: Raw bytes (or a zero-copy view) of the uploaded file.
+        encoding: Text encoding to decode the file with.
+        column_types: Explicit Arrow types for some columns; the rest
+            are inferred.
+
+    Returns:
+        The parsed table.
+    """
+    return pa_csv.read_csv(
+        pa.py_buffer(file_bytes),
+        read_options=pa_csv.ReadOptions(
+            encoding=encoding, block_size=_ARROW_BLOCK_SIZE,
+        ),
+        # Quoted cells may span lines, as pandas allows
+        parse_options=pa_csv.ParseOptions(newlines_in_values=True),
+        convert_options=pa_csv.ConvertOptions(
+            column_types=column_types,
+            null_values=_PANDAS_NA_VALUES,
+            strings_can_be_null=True,
+        ),
+    )
+
+
+def _read_csv(file_bytes: bytes | memoryview, encoding: str) -> pd.DataFrame:
+    """Parse CSV bytes, preferring PyArrow's multithreaded reader.
+
+    The PyArrow path is set up to load the same frame as ``pd.read_csv``:
+    it uses pandas' missing-value markers, keeps dates and times as text,
+    and reads all-empty columns and gaps in boolean columns as NaN. It
+    falls back to ``pd.read_csv`` when PyArrow is not installed, rejects
+    the file (e.g. rows with missing trailing fields, which pandas pads
+    with NaN), or the result would still differ: blank or duplicate
+    header names (which pandas renames) and integers outside the int64
+    range (which pandas keeps exact as uint64 or Python ints). One
+    difference remains: PyArrow rounds decimal floats exactly, where
+    pandas' default parser can be one unit in the last place off.
+    PyArrow reads ``file_bytes`` in place; only the pandas fallback
+    copies it.
+
+    Args:
+        file_bytes: Raw bytes (or a zero-copy view) of the uploaded file.
+        encoding: Text encoding to decode the file with.
+
+    Returns:
+        The parsed DataFrame.
+    """
+    if pa_csv is None:
+        return pd.read_csv(BytesIO(file_bytes), encoding=encoding)
+
+    try:
+        table = _arrow_table(file_bytes, encoding)
+        names = table.column_names
+        if "" in names or len(set(names)) != len(names):
+            return pd.read_csv(BytesIO(file_bytes), encoding=encoding)
+        temporal = {
+            f.name: pa.string()
+            for f in table.schema
+            if pa.types.is_temporal(f.type)
+        }
+        if temporal:
+            table = _arrow_table(file_bytes, encoding, temporal)
+    except pa.ArrowInvalid:
+        return pd.read_csv(BytesIO(file_bytes), encoding=encoding)
+
+    for i, f in enumerate(table.schema):
+        if pa.types.is_floating(f.type):
+            # Integers past int64 are inferred as lossy doubles
+            largest = pc.max(pc.abs(table.column(i))).as_py()
+            if largest is not None and largest >= _INT64_LIMIT:
+                return pd.read_csv(BytesIO(file_bytes), encoding=encoding)
+        elif pa.types.is_null(f.type):
+            table = table.set_column(
+                i, f.name, table.column(i).cast(pa.float64()),
+            )
+    df = table.to_pandas()
+    # Booleans with gaps arrive as objects holding None; pandas uses NaN
+    for f in table.schema:
+        if pa.types.is_boolean(f.type) and table.column(f.name).null_count:
+            df[f.name] = df[f.name].where(df[f.name].notna(), np.nan)
+    return df
+
+
+@st.cache_data(show_spinner="Loading CSV...", max_entries=4)
 def load_csv(
-    file_bytes: bytes,
+    content_key: str,
     file_name: str,
     max_rows: int = MAX_ROWS_DEFAULT,
+    *,
+    _file_bytes: bytes | memoryview,
 ) -> tuple[pd.DataFrame, list[str]]:
     """Load and validate a CSV file, returning (DataFrame, warnings).
 
     Args:
-        file_bytes: Raw bytes of the uploaded file.
+        content_key: ``file_digest`` of ``_file_bytes``; the cache key.
         file_name: Original filename (used in messages only).
         max_rows: Maximum rows to keep; excess rows are sampled.
+        _file_bytes: Raw bytes (or a zero-copy view) of the uploaded
+            file. The leading underscore keeps Streamlit from hashing
+            them.
 
     Returns:
         A tuple of (validated DataFrame, list of warning strings).
@@ -30,21 +216,18 @@ def load_csv(
         ValueError: If the CSV is empty or unreadable.
     """
     warnings: list[str] = []
-    buf = BytesIO(file_bytes)
 
     # Encoding fallback: utf-8 → latin-1
-    try:
-        df = pd.read_csv(buf, encoding="utf-8")
-    except UnicodeDecodeError:
-        buf.seek(0)
-        df = pd.read_csv(buf, encoding="latin-1")
+    encoding = _detect_encoding(_file_bytes)
+    if encoding != "utf-8":
         warnings.append("File was read with latin-1 encoding (utf-8 failed).")
+    df = _read_csv(_file_bytes, encoding)
 
     if df.empty or df.shape[0] == 0:
         raise ValueError("The uploaded CSV is empty.")
 
     # Drop columns that are 100 % null
-    all_null_cols = [c for c in df.columns if df[c].isna().all()]
+    all_null_cols = df.columns[df.isna().all()].tolist()
     if all_null_cols:
         df = df.drop(columns=all_null_cols)
         warnings.append(
@@ -61,11 +244,40 @@ def load_csv(
         )
 
     # Sample if too many rows
-    if df.shape[0] > max_rows:
-        df = df.sample(n=max_rows, random_state=RANDOM_SEED)
+    n_original = df.shape[0]
+    if n_original > max_rows:
+        df = df.sample(n=max_rows, random_state=RANDOM_SEED, ignore_index=True)
         warnings.append(
             f"Dataset sampled to {max_rows:,} rows "
-            f"(original: {df.shape[0]:,})."
+            f"(original: {n_original:,})."
         )
 
-    return df, warnings
+    return _downcast_columns(df), warnings
+
+
+def _downcast_columns(df: pd.DataFrame) -> pd.DataFrame:
+    """Store columns in the narrowest dtype that holds their values.
+
+    Integers shrink to the smallest integer type that fits their range,
+    floats to float32 only when every value round-trips exactly, and
+    repetitive string columns become categoricals, so later stats and
+    plot passes move fewer bytes without changing any value.
+
+    Args:
+        df: The validated DataFrame.
+
+    Returns:
+        The DataFrame with downcast columns.
+    """
+    df = df.copy()
+    for col in df.select_dtypes(include="integer").columns:
+        df[col] = pd.to_numeric(df[col], downcast="integer")
+    for col in df.select_dtypes(include="float").columns:
+        values = df[col].to_numpy()
+        narrow = values.astype(np.float32)
+        if np.array_equal(values, narrow, equal_nan=True):
+            df[col] = narrow
+    for col in df.select_dtypes(include=["object", "string"]).columns:
+        if df[col].nunique() / len(df) < MAX_CATEGORY_UNIQUE_RATIO:
+            df[col] = df[col].astype("category")
+    return df
@@ -2,13 +2,41 @@
 
 from __future__ import annotations
 
+import re
 from dataclasses import dataclass, field
 
 import pandas as pd
-
-from modules.constants import MAX_UNIQUE_FOR_CATEGORICAL
+import streamlit as st
+
+from modules.constants import (
+    DATETIME_MIN_PARSED_RATIO,
+    DATETIME_SAMPLE_ROWS,
+    MAX_CATEGORICAL_BARS,
+    MAX_UNIQUE_FOR_CATEGORICAL,
+)
+from modules.data_loader import df_fingerprint
 from modules.schema_parser import UserSchema
 
+_MONTH_NAME = (
+    r"(?:jan(?:uary)?|feb(?:ruary)?|mar(?:ch)?|apr(?:il)?|may|june?|july?"
+    r"|aug(?:ust)?|sep(?:t(?:ember)?)?|oct(?:ober)?|nov(?:ember)?"
+    r"|dec(?:ember)?)\.?"
+)
+_WEEKDAY_NAME = (
+    r"(?:mon|tues?|wed(?:nes)?|thu(?:rs?)?|fri|sat(?:ur)?|sun)(?:day)?\.?"
+)
+
+# Leading date such as 2024-01-31, 31/01/2024, 31.01.24, Jan 31 2024,
+# 31 January 2024 or 31-Jan-2024, optionally after a weekday name.
+_DATE_PREFIX_RE = re.compile(
+    rf"^\s*(?:{_WEEKDAY_NAME},?\s+)?"
+    r"(?:\d{4}([-/.])\d{1,2}\1\d{1,2}"
+    r"|\d{1,2}([-/.])\d{1,2}\2\d{2,4}"
+    rf"|{_MONTH_NAME}\s+\d{{1,4}}\b"
+    rf"|\d{{1,2}}(?:st|nd|rd|th)?[\s-]+{_MONTH_NAME}[\s,-]+\d{{2,4}}\b)",
+    re.IGNORECASE,
+)
+
 
 @dataclass
 class ColumnMeta:
@@ -21,6 +49,9 @@ class ColumnMeta:
     null_count: int = 0
     pct_missing: float = 0.0
     n_unique: int = 0
+    # Most frequent values first, capped at MAX_CATEGORICAL_BARS entries;
+    # only set for categorical columns.
+    top_counts: pd.Series | None = None
 
 
 @dataclass
@@ -35,6 +66,11 @@ class SchemaInfo:
     columns: list[ColumnMeta] = field(default_factory=list)
 
 
+@st.cache_data(
+    show_spinner=False,
+    max_entries=8,
+    hash_funcs={pd.DataFrame: df_fingerprint},
+)
 def detect_schema(
     df: pd.DataFrame,
     user_schema: UserSchema | None = None,
@@ -61,11 +97,15 @@ def detect_schema(
     categorical_cols: list[str] = []
     datetime_cols: list[str] = []
 
+    n_total = len(df)
+    null_counts = df.isna().sum()
+    unique_counts = df.nunique()
+    dtypes = df.dtypes
+
     for col in df.columns:
-        null_count = int(df[col].isna().sum())
-        n_total = len(df)
+        null_count = int(null_counts[col])
         pct_missing = round(null_count / n_total * 100, 1) if n_total else 0.0
-        n_unique = int(df[col].nunique())
+        n_unique = int(unique_counts[col])
 
         # Determine semantic type
         if col in user_lookup:
@@ -76,7 +116,7 @@ def detect_schema(
 
         meta = ColumnMeta(
             name=col,
-            dtype=str(df[col].dtype),
+            dtype=str(dtypes[col]),
             semantic_type=semantic_type,
             description=description,
             null_count=null_count,
@@ -91,6 +131,8 @@ def detect_schema(
             datetime_cols.append(col)
         else:
             categorical_cols.append(col)
+            # Shared by the summary table and the univariate bar charts
+            meta.top_counts = df[col].value_counts().head(MAX_CATEGORICAL_BARS)
 
     return SchemaInfo(
         n_rows=len(df),
@@ -123,12 +165,34 @@ def _auto_detect_type(series: pd.Series, n_unique: int) -> str:
     if pd.api.types.is_datetime64_any_dtype(series):
         return "datetime"
 
-    # Object dtype: try parsing as datetime
-    if series.dtype == object:
-        try:
-            pd.to_datetime(series.dropna().head(50), infer_datetime_format=True)
-            return "datetime"
-        except (ValueError, TypeError):
-            pass
+    # Object, string or categorical text: sniff for dates
+    if (
+        pd.api.types.is_object_dtype(series)
+        or pd.api.types.is_string_dtype(series)
+        or isinstance(series.dtype, pd.CategoricalDtype)
+    ) and _looks_like_datetime(series):
+        return "datetime"
 
     return "categorical"
+
+
+def _looks_like_datetime(series: pd.Series) -> bool:
+    """Check whether a text column's leading values parse as dates.
+
+    A regex over a small sample rules out free-form text before the
+    comparatively slow ``pd.to_datetime`` parser is tried.
+
+    Args:
+        series: A text-valued column.
+
+    Returns:
+        True if most sampled values look like, and parse as, dates.
+    """
+    sample = series.dropna().head(DATETIME_SAMPLE_ROWS).astype(str)
+    if sample.empty:
+        return False
+    if sample.str.match(_DATE_PREFIX_RE).mean() < DATETIME_MIN_PARSED_RATIO:
+        return False
+    # utc=True lets values with different offsets parse together
+    parsed = pd.to_datetime(sample, errors="coerce", format="mixed", utc=True)
+    return parsed.notna().mean() >= DATETIME_MIN_PARSED_RATIO
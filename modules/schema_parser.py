@@ -7,12 +7,21 @@ import logging
 from dataclasses import dataclass, field
 from difflib import get_close_matches
 
-from openai import OpenAI
+from openai import AsyncOpenAI
 
 from modules.constants import OPENAI_MODEL
 
+try:
+    from rapidfuzz import fuzz, process
+except ImportError:  # RapidFuzz is optional; fall back to difflib
+    fuzz = None
+    process = None
+
 logger = logging.getLogger(__name__)
 
+# Minimum similarity (0-1) for a fuzzy column-name match.
+_FUZZY_CUTOFF = 0.6
+
 PARSE_SYSTEM_PROMPT = (
     "You are a data-schema parser. The user will provide a free-form "
     "description of a CSV dataset's columns. Return ONLY valid JSON with "
@@ -46,10 +55,10 @@ class UserSchema:
     columns: list[UserColumnInfo] = field(default_factory=list)
 
 
-def parse_schema_text(
+async def parse_schema_text(
     schema_text: str,
     csv_columns: list[str],
-    api_key: str,
+    client: AsyncOpenAI,
 ) -> UserSchema:
     """Parse free-form schema text into a structured UserSchema.
 
@@ -59,7 +68,7 @@ def parse_schema_text(
     Args:
         schema_text: Raw text describing columns (from st.text_area).
         csv_columns: Actual column names from the uploaded CSV.
-        api_key: OpenAI API key.
+        client: Shared async OpenAI client.
 
     Returns:
         A UserSchema with matched column info.
@@ -68,17 +77,16 @@ def parse_schema_text(
         return UserSchema()
 
     try:
-        raw = _call_openai(schema_text, api_key)
+        raw = await _call_openai(schema_text, client)
         return _build_user_schema(raw, csv_columns)
     except Exception:
         logger.exception("Failed to parse schema text via OpenAI")
         return UserSchema()
 
 
-def _call_openai(schema_text: str, api_key: str) -> dict:
+async def _call_openai(schema_text: str, client: AsyncOpenAI) -> dict:
     """Send schema text to OpenAI and return parsed JSON dict."""
-    client = OpenAI(api_key=api_key)
-    response = client.chat.completions.create(
+    response = await client.chat.completions.create(
         model=OPENAI_MODEL,
         response_format={"type": "json_object"},
         messages=[
@@ -101,6 +109,10 @@ def _build_user_schema(
         return UserSchema()
 
     lower_csv = [c.lower() for c in csv_columns]
+    # Lower-cased name -> first CSV column with that name
+    by_lower: dict[str, str] = {}
+    for real_name, lower in zip(csv_columns, lower_csv):
+        by_lower.setdefault(lower, real_name)
     matched: list[UserColumnInfo] = []
 
     for entry in columns_raw:
@@ -118,17 +130,38 @@ def _build_user_schema(
 
         # Case-insensitive match
         lower_name = name.lower()
-        if lower_name in lower_csv:
-            real_name = csv_columns[lower_csv.index(lower_name)]
-            matched.append(UserColumnInfo(real_name, col_type, desc))
+        if lower_name in by_lower:
+            matched.append(UserColumnInfo(by_lower[lower_name], col_type, desc))
             continue
 
-        # Fuzzy match (cutoff 0.6)
-        close = get_close_matches(lower_name, lower_csv, n=1, cutoff=0.6)
-        if close:
-            real_name = csv_columns[lower_csv.index(close[0])]
-            matched.append(UserColumnInfo(real_name, col_type, desc))
+        # Fuzzy match
+        close = _closest_column(lower_name, lower_csv)
+        if close is not None:
+            matched.append(UserColumnInfo(by_lower[close], col_type, desc))
         else:
             logger.warning("Schema column '%s' not found in CSV", name)
 
     return UserSchema(columns=matched)
+
+
+def _closest_column(name: str, candidates: list[str]) -> str | None:
+    """Return the candidate most similar to ``name``, if close enough.
+
+    Uses RapidFuzz's C++ Indel similarity when it is installed, which
+    scores like difflib's ratio without the pure-Python matcher.
+
+    Args:
+        name: Lower-cased column name from the user's schema.
+        candidates: Lower-cased CSV column names.
+
+    Returns:
+        The best match scoring at least ``_FUZZY_CUTOFF``, or None.
+    """
+    if process is None:
+        close = get_close_matches(name, candidates, n=1, cutoff=_FUZZY_CUTOFF)
+        return close[0] if close else None
+
+    best = process.extractOne(
+        name, candidates, scorer=fuzz.ratio, score_cutoff=_FUZZY_CUTOFF * 100,
+    )
+    return best[0] if best else None
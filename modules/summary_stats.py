@@ -2,9 +2,19 @@
 
 from __future__ import annotations
 
+import numpy as np
 import pandas as pd
+import streamlit as st
 
+from modules.data_loader import df_fingerprint
+from modules.schema_detector import SchemaInfo
 
+
+@st.cache_data(
+    show_spinner=False,
+    max_entries=8,
+    hash_funcs={pd.DataFrame: df_fingerprint},
+)
 def compute_numerical_stats(
     df: pd.DataFrame,
     numerical_cols: list[str],
@@ -24,66 +34,98 @@ def compute_numerical_stats(
         A DataFrame indexed by column name with one row per column
         and statistic names as column headers.
     """
-    records: list[dict[str, float]] = []
-    for col in numerical_cols:
-        series = df[col].dropna()
-        records.append(
-            {
-                "Mean": round(series.mean(), 2),
-                "Median": round(series.median(), 2),
-                "Std": round(series.std(), 2),
-                "Min": round(series.min(), 2),
-                "Max": round(series.max(), 2),
-                "25%": round(series.quantile(0.25), 2),
-                "75%": round(series.quantile(0.75), 2),
-                "Skewness": round(series.skew(), 2),
-            }
-        )
+    # One row per column, sorted so NaNs trail and the order statistics
+    # (min, max, quartiles) can be read off by position.
+    values = df[numerical_cols].to_numpy(dtype=np.float64, na_value=np.nan)
+    ordered = np.sort(values.T, axis=1)
+    n = np.count_nonzero(~np.isnan(ordered), axis=1)
+
+    with np.errstate(divide="ignore", invalid="ignore"):
+        mean = np.nansum(ordered, axis=1) / n
+        dev = ordered - mean[:, None]
+        dev_sq = dev * dev
+        m2 = np.nansum(dev_sq, axis=1) / n
+        m3 = np.nansum(dev_sq * dev, axis=1) / n
+        std = np.sqrt(m2 * n / (n - 1))
+        # Adjusted Fisher-Pearson estimator, as in pandas.Series.skew.
+        skew = np.sqrt(n * (n - 1.0)) / (n - 2.0) * m3 / m2**1.5
+    std = np.where(n < 2, np.nan, std)
+    skew = np.where(n < 3, np.nan, np.where(m2 == 0, 0.0, skew))
+
+    stats = {
+        "Mean": mean,
+        "Median": _sorted_quantile(ordered, n, 0.5),
+        "Std": std,
+        "Min": _sorted_quantile(ordered, n, 0.0),
+        "Max": _sorted_quantile(ordered, n, 1.0),
+        "25%": _sorted_quantile(ordered, n, 0.25),
+        "75%": _sorted_quantile(ordered, n, 0.75),
+        "Skewness": skew,
+    }
+    return pd.DataFrame(stats, index=numerical_cols).round(2)
+
+
+def _sorted_quantile(
+    ordered: np.ndarray,
+    n: np.ndarray,
+    q: float,
+) -> np.ndarray:
+    """Linearly interpolate a quantile from rows sorted NaN-last.
 
-    return pd.DataFrame(records, index=numerical_cols)
+    Args:
+        ordered: 2-D array with one sorted row per column.
+        n: Number of non-NaN values in each row.
+        q: Quantile to compute, between 0 and 1.
 
+    Returns:
+        A 1-D array with the quantile of each row (NaN for empty rows).
+    """
+    pos = q * np.maximum(n - 1, 0)
+    lower = np.floor(pos).astype(np.intp)
+    upper = np.minimum(lower + 1, np.maximum(n - 1, 0))
+    lo = np.take_along_axis(ordered, lower[:, None], axis=1)[:, 0]
+    hi = np.take_along_axis(ordered, upper[:, None], axis=1)[:, 0]
+    result = lo + (hi - lo) * (pos - lower)
+    return np.where(n == 0, np.nan, result)
 
-def compute_categorical_stats(
-    df: pd.DataFrame,
-    categorical_cols: list[str],
-) -> pd.DataFrame:
+
+def compute_categorical_stats(schema_info: SchemaInfo) -> pd.DataFrame:
     """Compute descriptive statistics for categorical columns.
 
     For each column the following are calculated: unique value count,
     mode (most frequent value), mode frequency, and a comma-separated
-    string of the top 5 most common values.
+    string of the top 5 most common values. All of them come from the
+    counts ``detect_schema`` already gathered.
 
     Args:
-        df: The source DataFrame.
-        categorical_cols: List of categorical column names to
-            analyse.
+        schema_info: Detected schema information.
 
     Returns:
-        A DataFrame indexed by column name with one row per column
-        and statistic names as column headers.
+        A DataFrame indexed by column name with one row per categorical
+        column and statistic names as column headers.
     """
+    meta_by_name = {meta.name: meta for meta in schema_info.columns}
     records: list[dict[str, str | int]] = []
-    for col in categorical_cols:
-        series = df[col].dropna()
-        value_counts = series.value_counts()
-        n_unique = series.nunique()
+    for col in schema_info.categorical_cols:
+        meta = meta_by_name[col]
+        value_counts = meta.top_counts
 
-        if len(value_counts) > 0:
+        if value_counts is not None and len(value_counts) > 0:
             mode_value = value_counts.index[0]
             mode_freq = int(value_counts.iloc[0])
+            top_5 = ", ".join(str(v) for v in value_counts.head(5).index)
         else:
             mode_value = "N/A"
             mode_freq = 0
-
-        top_5 = ", ".join(str(v) for v in value_counts.head(5).index)
+            top_5 = ""
 
         records.append(
             {
-                "Unique": n_unique,
+                "Unique": meta.n_unique,
                 "Mode": mode_value,
                 "Mode Freq": mode_freq,
                 "Top 5": top_5,
             }
         )
 
-    return pd.DataFrame(records, index=categorical_cols)
+    return pd.DataFrame(records, index=schema_info.categorical_cols)
@@ -4,13 +4,26 @@ from __future__ import annotations
 
 import logging
 
-import matplotlib.pyplot as plt
+import numpy as np
 import pandas as pd
 import seaborn as sns
-
-from modules.chart_helpers import PlotResult, configure_plot_style
-from modules.constants import MAX_CATEGORICAL_BARS, MAX_UNIVARIATE_PLOTS
-from modules.schema_detector import SchemaInfo
+import streamlit as st
+
+from modules.chart_helpers import (
+    PlotResult,
+    configure_plot_style,
+    figure_to_png,
+    new_axes,
+    plot_histogram,
+    render_parallel,
+    sample_for_plot,
+)
+from modules.constants import (
+    MAX_CATEGORICAL_BARS,
+    MAX_UNIVARIATE_PLOTS,
+)
+from modules.data_loader import df_fingerprint
+from modules.schema_detector import ColumnMeta, SchemaInfo
 
 logger = logging.getLogger(__name__)
 
@@ -19,6 +32,11 @@ _DEFAULT_NUM_SLOTS = 5
 _DEFAULT_CAT_SLOTS = 4
 
 
+@st.cache_resource(
+    show_spinner=False,
+    max_entries=4,
+    hash_funcs={pd.DataFrame: df_fingerprint},
+)
 def generate_univariate_plots(
     df: pd.DataFrame,
     schema_info: SchemaInfo,
@@ -41,7 +59,7 @@ def generate_univariate_plots(
     configure_plot_style()
 
     num_cols = _select_numerical_columns(df, schema_info)
-    cat_cols = _select_categorical_columns(df, schema_info)
+    cat_cols = _select_categorical_columns(schema_info)
 
     # Determine slot allocation ----------------------------------------
     num_slots, cat_slots = _allocate_slots(
@@ -51,19 +69,18 @@ def generate_univariate_plots(
     selected_num = num_cols[:num_slots]
     selected_cat = cat_cols[:cat_slots]
 
-    plots: list[PlotResult] = []
-
-    for col in selected_num:
-        result = _create_histogram(df, col)
-        if result is not None:
-            plots.append(result)
+    # Render in worker processes, shipping only each column's values
+    tasks = [
+        (_create_histogram, (df[col].to_numpy(), col))
+        for col in selected_num
+    ]
+    meta_by_name = {meta.name: meta for meta in schema_info.columns}
+    tasks += [
+        (_create_bar_chart, (meta_by_name[col], schema_info.n_rows))
+        for col in selected_cat
+    ]
 
-    for col in selected_cat:
-        result = _create_bar_chart(df, col)
-        if result is not None:
-            plots.append(result)
-
-    return plots
+    return [plot for plot in render_parallel(tasks) if plot is not None]
 
 
 # -- private helpers -----------------------------------------------------
@@ -107,6 +124,9 @@ def _select_numerical_columns(
 ) -> list[str]:
     """Rank numerical columns by variance (descending).
 
+    Columns whose variance cannot be computed (e.g. text declared
+    numerical in a user schema, or all-missing) are left out.
+
     Args:
         df: The loaded DataFrame.
         schema_info: Detected schema information.
@@ -114,60 +134,49 @@ def _select_numerical_columns(
     Returns:
         Column names sorted by descending variance.
     """
-    variances: list[tuple[str, float]] = []
-    for col in schema_info.numerical_cols:
-        try:
-            var = df[col].var()
-            if pd.notna(var):
-                variances.append((col, float(var)))
-        except TypeError:
-            logger.debug("Skipping column %s: variance not computable", col)
+    variances = df[schema_info.numerical_cols].var(numeric_only=True).dropna()
+    return variances.sort_values(ascending=False, kind="stable").index.tolist()
 
-    variances.sort(key=lambda x: x[1], reverse=True)
-    return [col for col, _ in variances]
 
-
-def _select_categorical_columns(
-    df: pd.DataFrame,
-    schema_info: SchemaInfo,
-) -> list[str]:
+def _select_categorical_columns(schema_info: SchemaInfo) -> list[str]:
     """Rank categorical columns by unique-value count (descending).
 
+    Uses the counts ``detect_schema`` already computed rather than
+    rescanning the columns.
+
     Args:
-        df: The loaded DataFrame.
         schema_info: Detected schema information.
 
     Returns:
         Column names sorted by descending unique count.
     """
-    unique_counts: list[tuple[str, int]] = []
-    for col in schema_info.categorical_cols:
-        n_unique = int(df[col].nunique())
-        unique_counts.append((col, n_unique))
+    n_unique = {meta.name: meta.n_unique for meta in schema_info.columns}
+    unique_counts: list[tuple[str, int]] = [
+        (col, n_unique[col]) for col in schema_info.categorical_cols
+    ]
 
     unique_counts.sort(key=lambda x: x[1], reverse=True)
     return [col for col, _ in unique_counts]
 
 
 def _create_histogram(
-    df: pd.DataFrame,
+    values: np.ndarray,
     col: str,
 ) -> PlotResult | None:
     """Create a histogram with KDE overlay for a numerical column.
 
     Args:
-        df: The loaded DataFrame.
+        values: The column's values.
         col: The column name to plot.
 
     Returns:
         A PlotResult, or None if the plot could not be created.
     """
     try:
-        series = df[col].dropna()
-        fig, ax = plt.subplots()
-        sns.histplot(data=df, x=col, kde=True, ax=ax)
+        series = pd.Series(values, name=col).dropna()
+        fig, ax = new_axes()
+        plot_histogram(ax, sample_for_plot(series))
         ax.set_title(col)
-        plt.tight_layout()
 
         desc = (
             f"Histogram of '{col}'. "
@@ -179,7 +188,7 @@ def _create_histogram(
         )
 
         return PlotResult(
-            figure=fig,
+            png_bytes=figure_to_png(fig),
             title=col,
             plot_type="histogram",
             description_for_ai=desc,
@@ -191,33 +200,34 @@ def _create_histogram(
 
 
 def _create_bar_chart(
-    df: pd.DataFrame,
-    col: str,
+    meta: ColumnMeta,
+    n_rows: int,
 ) -> PlotResult | None:
     """Create a horizontal bar chart for a categorical column.
 
     Values beyond ``MAX_CATEGORICAL_BARS`` are lumped into an
-    "Other" category.
+    "Other" category. Bars come from the value counts ``detect_schema``
+    already gathered, so the column itself is not rescanned.
 
     Args:
-        df: The loaded DataFrame.
-        col: The column name to plot.
+        meta: Schema metadata of the column to plot.
+        n_rows: Number of rows in the DataFrame.
 
     Returns:
         A PlotResult, or None if the plot could not be created.
     """
+    col = meta.name
     try:
-        counts = df[col].value_counts()
-        n_unique = len(counts)
+        counts = meta.top_counts
+        n_unique = meta.n_unique
 
         if n_unique > MAX_CATEGORICAL_BARS:
-            top = counts.iloc[:MAX_CATEGORICAL_BARS]
-            other_total = counts.iloc[MAX_CATEGORICAL_BARS:].sum()
+            other_total = n_rows - meta.null_count - counts.sum()
             counts = pd.concat(
-                [top, pd.Series({"Other": other_total})]
+                [counts, pd.Series({"Other": other_total})]
             )
 
-        fig, ax = plt.subplots()
+        fig, ax = new_axes()
         sns.barplot(
             x=counts.values,
             y=counts.index.astype(str),
@@ -226,10 +236,8 @@ def _create_bar_chart(
         )
         ax.set_title(col)
         ax.set_xlabel("Count")
-        plt.tight_layout()
 
-        mode_value = df[col].mode()
-        mode_str = str(mode_value.iloc[0]) if len(mode_value) > 0 else "N/A"
+        mode_str = str(counts.index[0]) if len(counts) > 0 else "N/A"
         mode_freq = int(counts.iloc[0]) if len(counts) > 0 else 0
 
         desc = (
@@ -240,7 +248,7 @@ def _create_bar_chart(
         )
 
         return PlotResult(
-            figure=fig,
+            png_bytes=figure_to_png(fig),
             title=col,
             plot_type="bar_chart",
             description_for_ai=desc,
@@ -0,0 +1,103 @@
+"""Tests for bivariate plot helpers."""
+
+from __future__ import annotations
+
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+from modules.bivariate_plots import (
+    _eta_squared_kernel,
+    _pearson_corr,
+    _ranked_pairs,
+)
+
+
+def _offset_frame() -> pd.DataFrame:
+    """Return columns whose variation is tiny next to their offset."""
+    rng = np.random.default_rng(0)
+    x = rng.normal(size=5_000)
+    return pd.DataFrame({
+        "x": 1e7 + x,
+        "y": 1e7 + x + rng.normal(scale=0.1, size=x.size),
+        "lon": -122.4 + x * 1e-3,
+    })
+
+
+def test_pearson_corr_with_missing_values_matches_pandas_on_offset_columns():
+    df = _offset_frame()
+    df.loc[::7, "y"] = np.nan
+    cols = list(df.columns)
+
+    corr = _pearson_corr(df.to_numpy(dtype=np.float64), cols)
+
+    np.testing.assert_allclose(corr.to_numpy(), df.corr().to_numpy(), atol=1e-5)
+
+
+def test_pearson_corr_without_missing_values_matches_pandas_on_offset_columns():
+    df = _offset_frame()
+    cols = list(df.columns)
+
+    corr = _pearson_corr(df.to_numpy(dtype=np.float64), cols)
+
+    np.testing.assert_allclose(corr.to_numpy(), df.corr().to_numpy(), atol=1e-5)
+
+
+def _pandas_eta_squared(groups: pd.Series, values: pd.Series) -> float:
+    """Compute eta-squared with a pandas groupby over complete rows."""
+    subset = pd.DataFrame({"g": groups, "v": values}).dropna()
+    if subset["g"].nunique() < 2:
+        return np.nan
+    grand_mean = subset["v"].mean()
+    ss_total = ((subset["v"] - grand_mean) ** 2).sum()
+    if ss_total == 0:
+        return 0.0
+    stats = subset.groupby("g", observed=True)["v"].agg(["size", "mean"])
+    ss_between = (stats["size"] * (stats["mean"] - grand_mean) ** 2).sum()
+    return ss_between / ss_total
+
+
+def test_eta_squared_kernel_matches_pandas_groupby():
+    rng = np.random.default_rng(0)
+    n = 2_000
+    groups = pd.Series(
+        pd.Categorical(rng.choice(list("abcd"), n), categories=list("abcdz"))
+    )
+    groups[rng.random(n) < 0.1] = np.nan
+    shift = groups.map({"a": 0.0, "b": 1.0, "c": 3.0, "d": -2.0}).astype(float)
+    cases = {
+        "related": shift.fillna(0).to_numpy() + rng.normal(size=n),
+        "unrelated": rng.normal(size=n),
+        "gappy": np.where(rng.random(n) < 0.2, np.nan, rng.normal(size=n)),
+        "constant": np.full(n, 7.0),
+        "one_group": np.where(groups == "a", 1.0, np.nan),
+    }
+    codes, uniques = pd.factorize(groups)
+
+    for name, values in cases.items():
+        result = _eta_squared_kernel(codes, values, len(uniques))
+        expected = _pandas_eta_squared(groups, pd.Series(values))
+        np.testing.assert_allclose(
+            result, expected, rtol=1e-10, equal_nan=True, err_msg=name,
+        )
+
+
+def test_ranked_pairs_matches_pairwise_loop():
+    rng = np.random.default_rng(0)
+    df = pd.DataFrame(rng.normal(size=(200, 6)), columns=list("abcdef"))
+    df["b"] = df["a"] * 2 + rng.normal(scale=0.5, size=200)
+    df["c"] = -df["a"]  # |r| of (b, c) ties (a, b)
+    df["f"] = np.nan
+    corr = df.corr()
+
+    for min_abs_r in (0.0, 0.3):
+        expected = [
+            (corr.columns[i], corr.columns[j], corr.iloc[i, j])
+            for i, j in combinations(range(len(corr.columns)), 2)
+            if not np.isnan(corr.iloc[i, j])
+            and abs(corr.iloc[i, j]) >= min_abs_r
+        ]
+        expected.sort(key=lambda pair: abs(pair[2]), reverse=True)
+
+        assert _ranked_pairs(corr, min_abs_r=min_abs_r) == expected
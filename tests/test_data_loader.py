@@ -0,0 +1,96 @@
+"""Tests for CSV loading helpers."""
+
+from __future__ import annotations
+
+from io import BytesIO
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from modules import data_loader
+from modules.data_loader import _detect_encoding, _downcast_columns, _read_csv
+
+
+def test_downcast_columns_keeps_every_value():
+    rng = np.random.default_rng(0)
+    n = 1_000
+    df = pd.DataFrame({
+        "small_ints": rng.integers(0, 100, n),
+        "big_ints": rng.integers(0, 2**40, n),
+        "halves": rng.integers(0, 100, n) / 2,
+        "precise": rng.normal(size=n),
+        "gappy_halves": np.where(rng.random(n) < 0.2, np.nan, 0.5),
+        "labels": rng.choice(["x", "y", "z"], n),
+        "ids": [f"id{i}" for i in range(n)],
+    })
+
+    result = _downcast_columns(df)
+
+    assert result.dtypes.astype(str).to_dict() == {
+        "small_ints": "int8",
+        "big_ints": "int64",
+        "halves": "float32",
+        "precise": "float64",
+        "gappy_halves": "float32",
+        "labels": "category",
+        "ids": str(df["ids"].dtype),
+    }
+    assert result.astype(object).equals(df.astype(object))
+
+
+def _pandas_read_with_retry(raw: bytes) -> pd.DataFrame:
+    """Read CSV bytes as UTF-8, retrying as latin-1 on a decode error."""
+    try:
+        return pd.read_csv(BytesIO(raw), encoding="utf-8")
+    except UnicodeDecodeError:
+        return pd.read_csv(BytesIO(raw), encoding="latin-1")
+
+
+@pytest.mark.parametrize("chunk", [1, 7, 1 << 20])
+@pytest.mark.parametrize(
+    "raw",
+    [
+        b"name,city\nann,paris\n",
+        "name,city\nzo\u00eb,m\u00fcnchen\n\u6771\u4eac,\U0001f600\n".encode(),
+        "\ufeffname,city\nann,k\u00f6ln\n".encode(),
+        "name,city\nzo\u00eb,m\u00fcnchen\n".encode("latin-1"),
+        "name,city\nann,\u00e9".encode()[:-1] + b"\n",  # truncated sequence
+    ],
+)
+def test_detect_encoding_matches_utf8_retry(monkeypatch, raw, chunk):
+    # Small chunks split multi-byte characters across decode calls.
+    monkeypatch.setattr(data_loader, "_UTF8_CHECK_CHUNK", chunk)
+
+    encoding = _detect_encoding(raw)
+
+    pd.testing.assert_frame_equal(
+        pd.read_csv(BytesIO(raw), encoding=encoding),
+        _pandas_read_with_retry(raw),
+    )
+
+
+@pytest.mark.parametrize(
+    "raw",
+    [
+        b",a,b\n0,1,x\n1,2,y\n",  # blank index header from to_csv()
+        b"a,a\n1,2\n",
+        b"a,b,\n1,2,\n",
+        b"a,b,c\n1,2,3\n4,5\n",
+        b'a,b\n1,"two\nlines"\n2,x\n',
+        b"a,b\n12345678901234567890,1\n1,2\n",
+        b"a\n-9223372036854775809\n",
+        b"a,b,c\n2024-01-01,10:00:00,2024-01-01 10:00\n2024-02-01,11:00:00,\n",
+        b"a\n2024-01-01T00:00:00Z\n",
+        b"a,b\nNA,1\nnull,2\nn/a,3\nNULL,4\nnan,5\n#N/A,6\nNone,7\n<NA>,8\n",
+        b"a,b\n,1\n,2\n",
+        b"a,b\n1,1\n,2\n",
+        b"a,b\nTrue,1\n,2\n",
+        b"a\ninf\n-inf\n1\n",
+        b"a\n0.5\n2.25\n-3\n",
+    ],
+)
+def test_read_csv_matches_pandas(raw):
+    pd.testing.assert_frame_equal(
+        _read_csv(raw, "utf-8"), pd.read_csv(BytesIO(raw), encoding="utf-8"),
+    )
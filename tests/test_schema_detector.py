@@ -0,0 +1,76 @@
+"""Tests for schema detection."""
+
+from __future__ import annotations
+
+import pandas as pd
+import pytest
+
+from modules.constants import DATETIME_MIN_PARSED_RATIO
+from modules.schema_detector import _looks_like_datetime
+
+
+def _pandas_parses_as_dates(values: list[str]) -> bool:
+    """Check whether pandas alone parses enough values as dates."""
+    parsed = pd.to_datetime(
+        pd.Series(values), errors="coerce", format="mixed", utc=True
+    )
+    return parsed.notna().mean() >= DATETIME_MIN_PARSED_RATIO
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["2024-01-31", "2024-02-29", "2023-12-01"],
+        ["2024-01-31 10:15:00", "2024-02-01 08:00", "2024-02-02T09:30:00Z"],
+        ["2024-01-31T10:15:00+01:00", "2024-02-01T08:00:00Z"],
+        ["2024/1/31", "2024/2/9"],
+        ["31/01/2024", "01/02/2024", "15/03/24"],
+        ["01-31-2024", "02-01-2024"],
+        ["31.01.2024", "01.02.24"],
+        ["Jan 31, 2024", "February 1 2024", "Sept. 5, 2024"],
+        ["31 January 2024", "1st Feb 2024", "05-Mar-2024"],
+        ["Tue, 05 Mar 2024 10:00:00", "Wednesday, March 6, 2024"],
+        ["Mar 2024", "Apr 2024"],
+        ["2024-01-31", "2024-02-01", "2024-02-02", "2024-02-03", "2024-02-04",
+         "2024-02-05", "2024-02-06", "2024-02-07", "2024-02-08", "2024-02-09",
+         "unknown"],
+    ],
+)
+def test_looks_like_datetime_accepts_what_pandas_parses(values):
+    assert _pandas_parses_as_dates(values)
+    assert _looks_like_datetime(pd.Series(values))
+    assert _looks_like_datetime(pd.Series(values, dtype="category"))
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["apple", "banana", "cherry"],
+        ["Marketing 12", "Sales 3"],
+        ["2024-01-31", "n/a", "unknown", "tbd"],
+        ["12 apples", "3 pears"],
+        ["", " "],
+    ],
+)
+def test_looks_like_datetime_rejects_what_pandas_rejects(values):
+    assert not _pandas_parses_as_dates(values)
+    assert not _looks_like_datetime(pd.Series(values))
+
+
+@pytest.mark.parametrize(
+    "values",
+    [
+        ["1.2.3", "2.1.4"],  # version strings
+        ["May", "June"],  # bare month names
+        ["2024", "2023"],  # years kept as text
+        ["10:30", "11:45"],  # times of day
+    ],
+)
+def test_looks_like_datetime_skips_non_dates_pandas_would_parse(values):
+    assert _pandas_parses_as_dates(values)
+    assert not _looks_like_datetime(pd.Series(values))
+
+
+def test_looks_like_datetime_ignores_missing_values():
+    assert _looks_like_datetime(pd.Series([None, "2024-01-31", None]))
+    assert not _looks_like_datetime(pd.Series([None, None], dtype=object))
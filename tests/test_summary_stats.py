@@ -0,0 +1,67 @@
+"""Tests for summary statistics."""
+
+from __future__ import annotations
+
+import numpy as np
+import pandas as pd
+
+from modules.summary_stats import _sorted_quantile, compute_numerical_stats
+
+
+def _pandas_stats(df: pd.DataFrame, cols: list[str]) -> pd.DataFrame:
+    """Compute the statistics one column at a time with pandas."""
+    records = []
+    for col in cols:
+        series = df[col].dropna()
+        records.append({
+            "Mean": series.mean(),
+            "Median": series.median(),
+            "Std": series.std(),
+            "Min": series.min(),
+            "Max": series.max(),
+            "25%": series.quantile(0.25),
+            "75%": series.quantile(0.75),
+            "Skewness": series.skew(),
+        })
+    return pd.DataFrame(records, index=cols).round(2)
+
+
+def test_compute_numerical_stats_matches_pandas():
+    rng = np.random.default_rng(0)
+    n = 1_001
+    df = pd.DataFrame({
+        "normal": rng.normal(10, 3, n),
+        "skewed": rng.exponential(2.0, n),
+        "ints": rng.integers(-50, 50, n),
+        "gappy": np.where(rng.random(n) < 0.3, np.nan, rng.normal(size=n)),
+        "constant": np.full(n, 4.0),
+        "two_values": [1.0, 5.0] + [np.nan] * (n - 2),
+        "empty": np.full(n, np.nan),
+    })
+    cols = list(df.columns)
+
+    stats = compute_numerical_stats(df, cols)
+
+    expected = _pandas_stats(df, cols)
+    assert list(stats.columns) == list(expected.columns)
+    # Both sides are rounded to two decimals, so allow one step of rounding.
+    np.testing.assert_allclose(
+        stats.to_numpy(), expected.to_numpy(), atol=0.0101, equal_nan=True,
+    )
+
+
+def test_sorted_quantile_matches_pandas_quantile():
+    rng = np.random.default_rng(1)
+    columns = [rng.normal(size=size) for size in (1, 2, 5, 100)]
+    columns.append(np.array([]))
+    width = max(len(c) for c in columns)
+    ordered = np.full((len(columns), width), np.nan)
+    for i, col in enumerate(columns):
+        ordered[i, :len(col)] = np.sort(col)
+    n = np.array([len(c) for c in columns])
+
+    for q in (0.0, 0.1, 0.25, 0.5, 0.75, 1.0):
+        expected = [pd.Series(col, dtype=float).quantile(q) for col in columns]
+        np.testing.assert_allclose(
+            _sorted_quantile(ordered, n, q), expected, rtol=1e-12, equal_nan=True,
+        )